@@ -0,0 +1,63 @@
+import re
+
+class KeywordMatcher:
+    """
+    Compiles keyword lists into one trie-shaped alternation regex per category.
+    A text is lowercased once and each category costs a single regex scan,
+    with the same substring semantics as synthetic_data.utils.contains_any_keyword.
+    """
+
+    def __init__(self, categories):
+        """
+        :param categories: dict mapping category name to a list of keywords
+        """
+        self.patterns = {
+            name: self.compile(keywords) for name, keywords in categories.items()
+        }
+
+    @staticmethod
+    def compile(keywords, longest=False, whole_words=False):
+        """
+        Compiles keywords into a trie-shaped regex, so shared prefixes are only tested once per position.
+        :param longest: match the longest keyword at a position (for extraction rather than flags)
+        :param whole_words: only match keywords delimited by word boundaries
+        """
+        if not keywords:
+            return None
+        trie = {}
+        for keyword in set(keywords):
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+        pattern = KeywordMatcher.trie_to_regex(trie, longest)
+        if whole_words:
+            pattern = rf"\b(?:{pattern})\b"
+        return re.compile(pattern)
+
+    @staticmethod
+    def trie_to_regex(node, longest=False):
+        """
+        :param longest: keep continuations past the end of a keyword as an optional group,
+                        so the match is the longest keyword rather than the shortest prefix
+        """
+        if "" in node and not longest:
+            # a keyword ends here: any longer continuation is redundant for "contains" checks
+            return ""
+        branches = [
+            re.escape(char) + KeywordMatcher.trie_to_regex(child, longest)
+            for char, child in sorted(node.items()) if char
+        ]
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?" if branches else ""
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    def flags(self, text):
+        """Returns {category: bool} for every category in one pass over the compiled patterns."""
+        text_lower = text.lower() if text else ""
+        return {
+            name: bool(text_lower) and pattern is not None and pattern.search(text_lower) is not None
+            for name, pattern in self.patterns.items()
+        }
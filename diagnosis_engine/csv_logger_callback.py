@@ -1,26 +1,132 @@
 import csv
+import json
+import time
+import numpy as np
+import torch
 from transformers import TrainerCallback
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 class CSVLoggerCallback(TrainerCallback):
-    def __init__(self, train_log_file, eval_log_file):
+    """
+    Logs training and evaluation events to CSV (and optionally JSONL).
+    File handles stay open with buffered writes and are flushed on epoch end
+    and closed on train end. Train rows carry throughput metrics averaged over
+    the steps since the previous log event.
+    """
+
+    TRAIN_COLUMNS = ["epoch", "step", "loss", "learning_rate", "step_time", "samples_per_sec", "tokens_per_sec", "peak_memory_mb"]
+    EVAL_COLUMNS = ["epoch", "eval_loss", "eval_bleu", "eval_exact_match", "other_metrics_if_any"]
+
+    def __init__(self, train_log_file, eval_log_file, jsonl_log_file=None, buffer_size=1 << 16):
         self.train_log_file = train_log_file
         self.eval_log_file = eval_log_file
-        
-        with open(self.train_log_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["epoch", "step", "loss", "learning_rate"])
-        with open(self.eval_log_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["epoch", "eval_loss", "eval_bleu", "other_metrics_if_any"])  
+        self.jsonl_log_file = jsonl_log_file
+        self.buffer_size = buffer_size
+
+        self.train_file = None
+        self.eval_file = None
+        self.jsonl_file = None
+        self.train_writer = None
+        self.eval_writer = None
+
+        self.samples_per_step = 0
+        self.tokens_per_sample = 0.0
+        self.step_start = None
+        self.window_time = 0.0
+        self.window_steps = 0
+
+        self._open()
+
+    def _open(self):
+        self.train_file = open(self.train_log_file, "w", newline="", buffering=self.buffer_size)
+        self.eval_file = open(self.eval_log_file, "w", newline="", buffering=self.buffer_size)
+        self.train_writer = csv.writer(self.train_file)
+        self.eval_writer = csv.writer(self.eval_file)
+        self.train_writer.writerow(self.TRAIN_COLUMNS)
+        self.eval_writer.writerow(self.EVAL_COLUMNS)
+
+        if self.jsonl_log_file:
+            self.jsonl_file = open(self.jsonl_log_file, "w", buffering=self.buffer_size)
+
+    @staticmethod
+    def _tokens_per_sample(dataset, sample_size=1000):
+        """Average number of non-padding input + label tokens, estimated from a sample."""
+        if dataset is None or "attention_mask" not in getattr(dataset, "column_names", []):
+            return 0.0
+        sample = dataset.select(range(min(sample_size, len(dataset))))
+        tokens = np.asarray(sample["attention_mask"]).sum()
+        if "labels" in sample.column_names:
+            tokens += (np.asarray(sample["labels"]) != -100).sum()
+        return float(tokens) / max(len(sample), 1)
+
+    @staticmethod
+    def _peak_memory_mb():
+        if torch.cuda.is_available():
+            return torch.cuda.max_memory_allocated() / (1024 ** 2)
+        if resource is None:
+            return 0.0
+        # ru_maxrss is reported in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def _write_jsonl(self, record):
+        if self.jsonl_file is not None:
+            self.jsonl_file.write(json.dumps(record) + "\n")
+
+    def on_train_begin(self, args, state, control, train_dataloader=None, **kwargs):
+        if self.train_file is None or self.train_file.closed:
+            self._open()
+        self.samples_per_step = args.per_device_train_batch_size * args.gradient_accumulation_steps * max(args.world_size, 1)
+        dataset = getattr(train_dataloader, "dataset", None)
+        self.tokens_per_sample = self._tokens_per_sample(dataset)
+
+    def on_step_begin(self, args, state, control, **kwargs):
+        self.step_start = time.perf_counter()
+
+    def on_step_end(self, args, state, control, **kwargs):
+        if self.step_start is not None:
+            self.window_time += time.perf_counter() - self.step_start
+            self.window_steps += 1
+            self.step_start = None
 
     def on_log(self, args, state, control, logs=None, **kwargs):
         if logs is None:
             return
         if "loss" in logs:
-            with open(self.train_log_file, "a", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([state.epoch, state.global_step, logs.get("loss"), logs.get("learning_rate")])
+            step_time = self.window_time / self.window_steps if self.window_steps else 0.0
+            samples_per_sec = self.samples_per_step / step_time if step_time else 0.0
+            tokens_per_sec = samples_per_sec * self.tokens_per_sample
+            row = [
+                state.epoch, state.global_step, logs.get("loss"), logs.get("learning_rate"),
+                round(step_time, 4), round(samples_per_sec, 2), round(tokens_per_sec, 1), round(self._peak_memory_mb(), 1)
+            ]
+            self.train_writer.writerow(row)
+            self._write_jsonl({"type": "train", **dict(zip(self.TRAIN_COLUMNS, row))})
+            self.window_time = 0.0
+            self.window_steps = 0
         if "eval_loss" in logs:
-            with open(self.eval_log_file, "a", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([state.epoch, logs.get("eval_loss"), logs.get("eval_bleu", ""), ""])  
\ No newline at end of file
+            row = [state.epoch, logs.get("eval_loss"), logs.get("eval_bleu", ""), logs.get("eval_exact_match", ""), ""]
+            self.eval_writer.writerow(row)
+            self._write_jsonl({"type": "eval", "epoch": state.epoch, "step": state.global_step, **logs})
+
+    def flush(self):
+        for f in (self.train_file, self.eval_file, self.jsonl_file):
+            if f is not None and not f.closed:
+                f.flush()
+
+    def close(self):
+        for f in (self.train_file, self.eval_file, self.jsonl_file):
+            if f is not None and not f.closed:
+                f.close()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        self.flush()
+
+    def on_evaluate(self, args, state, control, **kwargs):
+        self.flush()
+
+    def on_train_end(self, args, state, control, **kwargs):
+        self.close()
@@ -0,0 +1,12 @@
+from diagnosis_engine.prediction_strategy import PredictionStrategy
+from diagnosis_engine.models.distilled_diagnosis_classifier import DistilledDiagnosisClassifier
+
+class DistilledDiagnosisClassifierStrategy(PredictionStrategy):
+    def __init__(self, model_path="diagnosis_engine/trained_models/distilled"):
+        self.model = DistilledDiagnosisClassifier(student_path=model_path)
+
+    def load_model(self, model_path):
+        self.model.load_model(model_path)
+
+    def generate_disease_name(self, symptom_description):
+        return self.model.generate_disease_name(symptom_description)
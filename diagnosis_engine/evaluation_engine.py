@@ -0,0 +1,142 @@
+import csv
+import os
+import time
+import evaluate
+import numpy as np
+import torch
+
+_METRICS = {}
+
+def load_metric(name):
+    """Loads an `evaluate` metric once per process and reuses it afterwards."""
+    if name not in _METRICS:
+        _METRICS[name] = evaluate.load(name)
+    return _METRICS[name]
+
+
+class EvaluationEngine:
+    """
+    Fast evaluation path for the seq2seq diagnosis classifiers.
+    Batches are built from the test set sorted by input length and trimmed to the
+    longest sequence of each batch, so generation never runs over padding columns.
+    """
+
+    def __init__(self, model, tokenizer, device, batch_size=64, max_new_tokens=32):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.batch_size = batch_size
+        self.max_new_tokens = max_new_tokens
+
+    @staticmethod
+    def length_sorted_batches(lengths, batch_size):
+        """Returns index batches over the examples ordered from longest to shortest."""
+        order = np.argsort(-np.asarray(lengths), kind="stable")
+        return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+    @staticmethod
+    def exact_match(preds_text, labels_text):
+        """Case- and whitespace-insensitive comparison of decoded strings, as in earlier runs."""
+        return np.array(
+            [pred.strip().lower() == label.strip().lower() for pred, label in zip(preds_text, labels_text)],
+            dtype=bool
+        )
+
+    def evaluate(self, dataset, compute_metrics=True, predictions_path=None):
+        """
+        Evaluates the model on a tokenized dataset with input_ids, attention_mask and labels.
+        Returns eval_loss and eval_exact_match, plus ROUGE-L and BLEU when compute_metrics is set.
+        Per-example predictions are streamed to predictions_path as CSV when given.
+        """
+        start = time.perf_counter()
+        pad_id = self.tokenizer.pad_token_id
+
+        input_ids = np.asarray(dataset["input_ids"])
+        attention_mask = np.asarray(dataset["attention_mask"])
+        labels = np.asarray(dataset["labels"])
+
+        input_lengths = attention_mask.sum(axis=1)
+        label_lengths = (labels != -100).sum(axis=1)
+
+        decoded_preds = []
+        decoded_labels = []
+        matches = np.zeros(len(input_ids), dtype=bool)
+        total_loss = 0.0
+
+        writer = None
+        predictions_file = None
+        if predictions_path:
+            os.makedirs(os.path.dirname(predictions_path) or ".", exist_ok=True)
+            predictions_file = open(predictions_path, "w", newline="", buffering=1 << 16)
+            writer = csv.writer(predictions_file)
+            writer.writerow(["index", "prediction", "target", "exact_match"])
+
+        self.model.eval()
+        try:
+            with torch.inference_mode():
+                for batch_idx in self.length_sorted_batches(input_lengths, self.batch_size):
+                    in_width = max(int(input_lengths[batch_idx].max()), 1)
+                    label_width = max(int(label_lengths[batch_idx].max()), 1)
+
+                    batch_inputs = torch.as_tensor(input_ids[batch_idx, :in_width], device=self.device)
+                    batch_mask = torch.as_tensor(attention_mask[batch_idx, :in_width], device=self.device)
+                    batch_labels = labels[batch_idx, :label_width]
+
+                    encoder_outputs = self.model.get_encoder()(
+                        input_ids=batch_inputs, attention_mask=batch_mask
+                    )
+
+                    loss = self.model(
+                        encoder_outputs=encoder_outputs,
+                        attention_mask=batch_mask,
+                        labels=torch.as_tensor(batch_labels, device=self.device),
+                    ).loss
+                    total_loss += loss.item() * len(batch_idx)
+
+                    generated = self.model.generate(
+                        encoder_outputs=encoder_outputs,
+                        attention_mask=batch_mask,
+                        max_new_tokens=self.max_new_tokens,
+                    ).cpu().numpy()
+
+                    # generate() prepends the decoder start token
+                    generated = generated[:, 1:]
+                    preds_text = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+                    labels_text = self.tokenizer.batch_decode(
+                        np.where(batch_labels != -100, batch_labels, pad_id),
+                        skip_special_tokens=True
+                    )
+                    batch_matches = self.exact_match(preds_text, labels_text)
+                    matches[batch_idx] = batch_matches
+
+                    if compute_metrics:
+                        decoded_preds.extend(preds_text)
+                        decoded_labels.extend(labels_text)
+                    if writer is not None:
+                        writer.writerows(
+                            zip(batch_idx.tolist(), preds_text, labels_text, batch_matches.astype(int).tolist())
+                        )
+        finally:
+            if predictions_file is not None:
+                predictions_file.close()
+
+        n_examples = max(len(input_ids), 1)
+        metrics = {
+            "eval_loss": round(total_loss / n_examples, 4),
+            "eval_exact_match": round(float(matches.mean()) if len(matches) else 0.0, 4),
+        }
+
+        if compute_metrics and decoded_preds:
+            rouge_result = load_metric("rouge").compute(
+                predictions=decoded_preds, references=decoded_labels, use_stemmer=True
+            )
+            bleu_result = load_metric("bleu").compute(
+                predictions=decoded_preds, references=decoded_labels,
+            )
+            metrics["eval_rougeL"] = round(rouge_result["rougeL"], 4)
+            metrics["eval_bleu"] = round(bleu_result["bleu"], 4)
+
+        runtime = time.perf_counter() - start
+        metrics["eval_runtime"] = round(runtime, 4)
+        metrics["eval_samples_per_second"] = round(len(input_ids) / runtime, 3) if runtime else 0.0
+        return metrics
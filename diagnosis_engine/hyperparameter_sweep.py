@@ -0,0 +1,192 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datasets import DatasetDict, load_from_disk
+from transformers import TrainerCallback
+from diagnosis_engine.models.context_diagnosis_classifier import ContextDiagnosisClassifier
+import csv
+import hashlib
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+import time
+import torch
+
+class MedianPruningCallback(TrainerCallback):
+    """
+    Stops a trial when its eval_loss after an epoch is worse than the median
+    eval_loss reported by the other trials at the same epoch.
+    """
+
+    def __init__(self, trial_id, history, lock, warmup_epochs=1, min_trials=2):
+        self.trial_id = trial_id
+        self.history = history
+        self.lock = lock
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+        self.pruned = False
+
+    def on_evaluate(self, args, state, control, metrics=None, **kwargs):
+        if not metrics or "eval_loss" not in metrics:
+            return
+        epoch = int(round(state.epoch or 0))
+        loss = metrics["eval_loss"]
+
+        with self.lock:
+            reported = self.history.get(epoch, [])
+            self.history[epoch] = reported + [loss]
+
+        if epoch <= self.warmup_epochs or len(reported) < self.min_trials:
+            return
+        if loss > statistics.median(reported):
+            self.pruned = True
+            control.should_training_stop = True
+
+
+class HyperparameterSweep:
+    """
+    Runs training trials of the ContextDiagnosisClassifier over a search space in a process pool.
+    Each worker is pinned to its own subset of CPU cores, tokenized datasets are cached on disk
+    per (max_input_length, max_target_length) and shared across trials, and poor trials are pruned
+    from their per-epoch eval_loss. Results are written to a leaderboard CSV.
+    """
+
+    LEADERBOARD_COLUMNS = [
+        "trial", "learning_rate", "batch_size", "max_input_length", "max_target_length", "num_train_epochs",
+        "pruned", "eval_loss", "exact_match", "train_seconds", "inference_ms_per_sample"
+    ]
+
+    def __init__(self, search_space, model_name="t5-small",
+                 dataset_path="data/synthetic/final_training_dataset.csv",
+                 output_dir="diagnosis_engine/trained_models/sweep",
+                 n_workers=2, n_trials=None, seed=42):
+        """
+        :param search_space: dict mapping learning_rate, batch_size, max_input_length,
+                             max_target_length and num_train_epochs to lists of values
+        :param n_trials: random subset of the grid to run (all combinations when None)
+        """
+        self.search_space = search_space
+        self.model_name = model_name
+        self.dataset_path = dataset_path
+        self.output_dir = output_dir
+        self.cache_dir = os.path.join(output_dir, "tokenized_cache")
+        self.n_workers = n_workers
+        self.n_trials = n_trials
+        self.seed = seed
+
+    def trials(self):
+        keys = list(self.search_space)
+        grid = [dict(zip(keys, values)) for values in itertools.product(*(self.search_space[k] for k in keys))]
+        if self.n_trials is not None and self.n_trials < len(grid):
+            grid = random.Random(self.seed).sample(grid, self.n_trials)
+        return grid
+
+    def cached_dataset_path(self, max_input_length, max_target_length):
+        """Tokenizes the dataset once per length combination and returns the cached DatasetDict path."""
+        stat = os.stat(self.dataset_path)
+        key = f"{os.path.abspath(self.dataset_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.model_name}|{max_input_length}|{max_target_length}"
+        path = os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest()[:16])
+        if os.path.exists(path):
+            return path
+
+        classifier = ContextDiagnosisClassifier(
+            model_name=self.model_name, dataset_path=self.dataset_path,
+            max_input_length=max_input_length, max_target_length=max_target_length
+        )
+        classifier.load_local_dataset()
+        classifier.prepare_dataset()
+
+        DatasetDict({"train": classifier.train_dataset, "test": classifier.test_dataset}).save_to_disk(path)
+        return path
+
+    def core_sets(self):
+        """Splits the available CPU cores into one disjoint subset per worker."""
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+        per_worker = max(len(cores) // self.n_workers, 1)
+        return [cores[i * per_worker:(i + 1) * per_worker] or cores for i in range(self.n_workers)]
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        trials = self.trials()
+
+        dataset_paths = {}
+        for params in trials:
+            lengths = (params["max_input_length"], params["max_target_length"])
+            if lengths not in dataset_paths:
+                dataset_paths[lengths] = self.cached_dataset_path(*lengths)
+
+        manager = multiprocessing.Manager()
+        core_queue = manager.Queue()
+        for cores in self.core_sets():
+            core_queue.put(cores)
+        history = manager.dict()
+        lock = manager.Lock()
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_pin_worker, initargs=(core_queue,)) as pool:
+            futures = [
+                pool.submit(
+                    _run_trial, trial_id, params, self.model_name,
+                    dataset_paths[(params["max_input_length"], params["max_target_length"])],
+                    os.path.join(self.output_dir, f"trial_{trial_id}"), history, lock
+                )
+                for trial_id, params in enumerate(trials)
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        results.sort(key=lambda r: (r["pruned"], -r["exact_match"], r["train_seconds"]))
+        self.write_leaderboard(results)
+        return results
+
+    def write_leaderboard(self, results):
+        path = os.path.join(self.output_dir, "leaderboard.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.LEADERBOARD_COLUMNS)
+            writer.writeheader()
+            writer.writerows(results)
+        return path
+
+
+def _pin_worker(core_queue):
+    cores = core_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+
+
+def _run_trial(trial_id, params, model_name, dataset_path, output_dir, history, lock):
+    classifier = ContextDiagnosisClassifier(
+        model_name=model_name,
+        max_input_length=params["max_input_length"],
+        max_target_length=params["max_target_length"]
+    )
+    splits = load_from_disk(dataset_path)
+    classifier.train_dataset = splits["train"]
+    classifier.test_dataset = splits["test"]
+
+    pruner = MedianPruningCallback(trial_id, history, lock)
+    start = time.perf_counter()
+    classifier.train(
+        num_train_epochs=params["num_train_epochs"],
+        learning_rate=params["learning_rate"],
+        batch_size=params["batch_size"],
+        output_dir=output_dir,
+        save_checkpoints=False,
+        callbacks=[pruner]
+    )
+    train_seconds = time.perf_counter() - start
+
+    metrics = classifier.evaluate(compute_metrics=False)
+    return {
+        "trial": trial_id,
+        **{k: params[k] for k in ("learning_rate", "batch_size", "max_input_length", "max_target_length", "num_train_epochs")},
+        "pruned": pruner.pruned,
+        "eval_loss": metrics["eval_loss"],
+        "exact_match": metrics["eval_exact_match"],
+        "train_seconds": round(train_seconds, 2),
+        "inference_ms_per_sample": round(1000 / metrics["eval_samples_per_second"], 3) if metrics["eval_samples_per_second"] else None,
+    }
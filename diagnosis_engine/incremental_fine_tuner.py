@@ -0,0 +1,79 @@
+from datasets import Dataset
+import json
+import os
+import pandas as pd
+
+class IncrementalFineTuner:
+    """
+    Refreshes the context model from its current checkpoint using only the
+    doctor-confirmed records added since the previous run, mixed with a replay
+    sample of the original training data so earlier diagnoses are not forgotten.
+    """
+
+    def __init__(self, classifier,
+                 checkpoint_path="diagnosis_engine/trained_models/context",
+                 base_dataset_path="data/synthetic/final_training_dataset.csv",
+                 output_root="diagnosis_engine/trained_models/context_incremental",
+                 state_file=None, replay_ratio=4, max_steps=200, learning_rate=1e-5, seed=42):
+        """
+        :param classifier: instance of ContextDiagnosisClassifier created from checkpoint_path
+        :param output_root: Trainer checkpoints and metric logs go to output_root/run_<n>,
+            so incremental runs never overwrite the full-training logs in checkpoint_path
+        :param replay_ratio: number of original rows replayed per new record
+        :param max_steps: upper bound on optimizer steps for one refresh
+        """
+        self.classifier = classifier
+        self.checkpoint_path = checkpoint_path
+        self.base_dataset_path = base_dataset_path
+        self.output_root = output_root
+        self.state_file = state_file or os.path.join(checkpoint_path, "incremental_state.json")
+        self.replay_ratio = replay_ratio
+        self.max_steps = max_steps
+        self.learning_rate = learning_rate
+        self.seed = seed
+
+    def load_state(self):
+        """Returns the last processed record id (0 when no incremental run happened yet)."""
+        if not os.path.exists(self.state_file):
+            return {"last_record_id": 0, "runs": 0}
+        with open(self.state_file) as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with open(self.state_file, "w") as f:
+            json.dump(state, f, indent=2)
+
+    def build_dataset(self, new_df):
+        """Mixes the new rows with a replay sample of the original dataset."""
+        base_df = pd.read_csv(self.base_dataset_path)
+        n_replay = min(len(base_df), len(new_df) * self.replay_ratio)
+        replay_df = base_df.sample(n=n_replay, random_state=self.seed + self.load_state()["runs"])
+
+        mixed = pd.concat([new_df[["input_text", "target"]], replay_df[["input_text", "target"]]], ignore_index=True)
+        mixed = mixed.sample(frac=1, random_state=self.seed).reset_index(drop=True)
+        return Dataset.from_pandas(mixed)
+
+    def run(self, records_df):
+        """
+        Fine-tunes on the given records and saves the refreshed checkpoint.
+        :param records_df: DataFrame with record_id, input_text and target columns
+        :return: evaluation metrics, or None when there is nothing new to train on
+        """
+        state = self.load_state()
+        new_df = records_df[records_df["record_id"] > state["last_record_id"]]
+        if new_df.empty:
+            return None
+
+        run = state.get("runs", 0) + 1
+        self.classifier.dataset = self.build_dataset(new_df)
+        self.classifier.prepare_dataset(test_size=0.1)
+        self.classifier.train(max_steps=self.max_steps, learning_rate=self.learning_rate,
+                              output_dir=os.path.join(self.output_root, f"run_{run}"))
+        metrics = self.classifier.evaluate(compute_metrics=False)
+        self.classifier.save_model(self.checkpoint_path)
+
+        state["last_record_id"] = int(new_df["record_id"].max())
+        state["runs"] = run
+        self.save_state(state)
+        return metrics
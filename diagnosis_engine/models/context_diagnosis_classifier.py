@@ -7,15 +7,16 @@ from transformers import (
     DataCollatorForSeq2Seq
 )
 from diagnosis_engine.csv_logger_callback import CSVLoggerCallback
+from diagnosis_engine.evaluation_engine import EvaluationEngine
 import torch
 import os
 import pandas as pd
-import evaluate
-import numpy as np
 
 class ContextDiagnosisClassifier:
-    def __init__(self, model_name="t5-small", dataset_path=None):
+    def __init__(self, model_name="t5-small", dataset_path=None, max_input_length=256, max_target_length=32):
         self.model_name = model_name
+        self.max_input_length = max_input_length
+        self.max_target_length = max_target_length
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -27,7 +28,10 @@ class ContextDiagnosisClassifier:
         self.test_dataset = None
 
     def load_local_dataset(self):
-        """Loads a local CSV dataset with columns: input_text, target"""
+        """Loads a local CSV or Parquet dataset with columns: input_text, target"""
+        if self.dataset_path.endswith(".parquet"):
+            self.dataset = Dataset.from_parquet(self.dataset_path)
+            return
         df = pd.read_csv(self.dataset_path)
         self.dataset = Dataset.from_pandas(df)
 
@@ -41,14 +45,14 @@ class ContextDiagnosisClassifier:
 
         model_inputs = self.tokenizer(
             inputs,
-            max_length=256,
+            max_length=self.max_input_length,
             truncation=True,
             padding="max_length"
         )
 
         labels = self.tokenizer(
             targets,
-            max_length=32,
+            max_length=self.max_target_length,
             truncation=True,
             padding="max_length"
         )["input_ids"]
@@ -73,21 +77,25 @@ class ContextDiagnosisClassifier:
         self.train_dataset = split["train"]
         self.test_dataset = split["test"]
 
-    def train(self, num_train_epochs=5):
-        """Trains the T5 model"""
+    def train(self, num_train_epochs=5, max_steps=-1, learning_rate=2e-5, batch_size=16,
+              output_dir="diagnosis_engine/trained_models/context", save_checkpoints=True, callbacks=None):
+        """Trains the T5 model. A positive max_steps bounds training and overrides num_train_epochs."""
         data_collator = DataCollatorForSeq2Seq(self.tokenizer, model=self.model)
-        csv_logger = CSVLoggerCallback(train_log_file="diagnosis_engine/trained_models/context/metrics/train_context_log.csv", eval_log_file="diagnosis_engine/trained_models/context/metrics/eval__context_log.csv")
+        os.makedirs(os.path.join(output_dir, "metrics"), exist_ok=True)
+        csv_logger = CSVLoggerCallback(train_log_file=os.path.join(output_dir, "metrics", "train_context_log.csv"), eval_log_file=os.path.join(output_dir, "metrics", "eval__context_log.csv"))
 
         try:
             training_args = Seq2SeqTrainingArguments(
-                output_dir="diagnosis_engine/trained_models/context",
+                output_dir=output_dir,
                 eval_strategy="epoch",
                 logging_strategy="steps",
                 logging_steps=10,  
-                learning_rate=2e-5,
-                per_device_train_batch_size=16,
-                per_device_eval_batch_size=16,
+                learning_rate=learning_rate,
+                per_device_train_batch_size=batch_size,
+                per_device_eval_batch_size=batch_size,
                 num_train_epochs=num_train_epochs,
+                max_steps=max_steps,
+                save_strategy="steps" if save_checkpoints else "no",
                 save_total_limit=2,
                 predict_with_generate=True,
                 fp16=torch.cuda.is_available(),
@@ -96,11 +104,14 @@ class ContextDiagnosisClassifier:
             )
         except TypeError:
             training_args = Seq2SeqTrainingArguments(
+                output_dir=output_dir,
                 evaluation_strategy="epoch",
-                learning_rate=2e-5,
-                per_device_train_batch_size=16,
-                per_device_eval_batch_size=16,
+                learning_rate=learning_rate,
+                per_device_train_batch_size=batch_size,
+                per_device_eval_batch_size=batch_size,
                 num_train_epochs=num_train_epochs,
+                max_steps=max_steps,
+                save_strategy="steps" if save_checkpoints else "no",
                 save_total_limit=2,
                 predict_with_generate=True,
                 fp16=torch.cuda.is_available(),
@@ -115,71 +126,18 @@ class ContextDiagnosisClassifier:
             eval_dataset=self.test_dataset,
             tokenizer=self.tokenizer,
             data_collator=data_collator,
-            callbacks=[csv_logger]
+            callbacks=[csv_logger] + list(callbacks or [])
         )
 
         trainer.train()
 
-    def evaluate(self, compute_metrics=True):
+    def evaluate(self, compute_metrics=True, predictions_path=None):
         """Evaluates the model on the test set and computes final metrics (BLEU, ROUGE, Exact Match)."""
         if self.test_dataset is None:
             raise ValueError("Test dataset not prepared. Call load_local_dataset() and prepare_dataset() first.")
 
-        data_collator = DataCollatorForSeq2Seq(self.tokenizer, model=self.model)
-
-        args = Seq2SeqTrainingArguments(
-            output_dir="diagnosis_engine/trained_models/context",
-            per_device_eval_batch_size=16,
-            predict_with_generate=True,
-            report_to="none",
-        )
-
-        if compute_metrics:
-            rouge_metric = evaluate.load("rouge")
-            bleu_metric = evaluate.load("bleu")
-
-            def compute_metrics_fn(eval_pred):
-                predictions, labels = eval_pred
-                decoded_preds = self.tokenizer.batch_decode(predictions, skip_special_tokens=True)
-                decoded_labels = self.tokenizer.batch_decode(
-                    np.where(labels != -100, labels, self.tokenizer.pad_token_id),
-                    skip_special_tokens=True
-                )
-
-                rouge_result = rouge_metric.compute(
-                    predictions=decoded_preds, references=decoded_labels, use_stemmer=True
-                )
-
-                bleu_result = bleu_metric.compute(
-                    predictions=decoded_preds,
-                    references=decoded_labels,
-                )
-
-                exact_matches = np.mean([
-                    int(pred.strip().lower() == label.strip().lower())
-                    for pred, label in zip(decoded_preds, decoded_labels)
-                ])
-
-                result = {
-                    "rougeL": round(rouge_result["rougeL"], 4),
-                    "bleu": round(bleu_result["bleu"], 4),
-                    "exact_match": round(exact_matches, 4)
-                }
-                return result
-        else:
-            compute_metrics_fn = None
-
-        trainer = Seq2SeqTrainer(
-            model=self.model,
-            args=args,
-            eval_dataset=self.test_dataset,
-            tokenizer=self.tokenizer,
-            data_collator=data_collator,
-            compute_metrics=compute_metrics_fn
-        )
-
-        metrics = trainer.evaluate()
-        return metrics
+        engine = EvaluationEngine(self.model, self.tokenizer, self.device)
+        return engine.evaluate(self.test_dataset, compute_metrics=compute_metrics, predictions_path=predictions_path)
 
     def generate_disease_name(self, patient_description):
         """Generates a diagnosis from a free-text patient description"""
@@ -188,7 +146,7 @@ class ContextDiagnosisClassifier:
             return_tensors="pt",
             truncation=True,
             padding="max_length",
-            max_length=256
+            max_length=self.max_input_length
         ).to(self.device)
 
         outputs = self.model.generate(inputs["input_ids"])
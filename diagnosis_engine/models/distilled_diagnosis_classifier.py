@@ -0,0 +1,132 @@
+from transformers import (
+    AutoModelForSeq2SeqLM,
+    AutoTokenizer,
+    Seq2SeqTrainingArguments,
+    Seq2SeqTrainer,
+    DataCollatorForSeq2Seq
+)
+from diagnosis_engine.csv_logger_callback import CSVLoggerCallback
+from diagnosis_engine.models.context_diagnosis_classifier import ContextDiagnosisClassifier
+import torch
+import torch.nn.functional as F
+import os
+
+class DistillationTrainer(Seq2SeqTrainer):
+    """Seq2SeqTrainer whose loss blends the label loss with the KL divergence to the teacher's soft targets."""
+
+    def __init__(self, *args, teacher_model=None, temperature=2.0, alpha=0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.teacher_model = teacher_model
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def compute_loss(self, model, inputs, return_outputs=False, **kwargs):
+        outputs = model(**inputs)
+
+        with torch.no_grad():
+            teacher_logits = self.teacher_model(**inputs).logits
+
+        mask = (inputs["labels"] != -100).float()
+        t = self.temperature
+        kl = F.kl_div(
+            F.log_softmax(outputs.logits / t, dim=-1),
+            F.softmax(teacher_logits / t, dim=-1),
+            reduction="none"
+        ).sum(dim=-1)
+        distill_loss = (kl * mask).sum() / mask.sum().clamp(min=1) * (t ** 2)
+
+        loss = self.alpha * distill_loss + (1 - self.alpha) * outputs.loss
+        return (loss, outputs) if return_outputs else loss
+
+
+class DistilledDiagnosisClassifier(ContextDiagnosisClassifier):
+    """
+    Small student seq2seq model distilled from the fine-tuned ContextDiagnosisClassifier.
+    The student reuses the teacher's tokenizer and vocabulary with fewer layers and a smaller d_model,
+    so it can be served on CPU nodes.
+    Pass student_path to load an already distilled student for serving without the teacher.
+    """
+
+    def __init__(self, teacher_path="diagnosis_engine/trained_models/context", dataset_path=None,
+                 student_path=None, num_layers=2, d_model=256, d_ff=1024, num_heads=4):
+        if student_path is not None:
+            super().__init__(model_name=student_path, dataset_path=dataset_path)
+            self.teacher_model = None
+            return
+
+        super().__init__(model_name=teacher_path, dataset_path=dataset_path)
+
+        self.teacher_model = self.model
+        self.teacher_model.eval()
+
+        student_config = self.teacher_model.config.__class__.from_dict(self.teacher_model.config.to_dict())
+        student_config.num_layers = num_layers
+        student_config.num_decoder_layers = num_layers
+        student_config.d_model = d_model
+        student_config.d_ff = d_ff
+        student_config.num_heads = num_heads
+        student_config.d_kv = d_model // num_heads
+
+        self.model = AutoModelForSeq2SeqLM.from_config(student_config).to(self.device)
+
+    def train(self, num_train_epochs=10, learning_rate=5e-4, temperature=2.0, alpha=0.5):
+        """Trains the student on the teacher's soft targets over the prepared dataset"""
+        if self.teacher_model is None:
+            raise ValueError("Teacher model not loaded. Distillation needs the fine-tuned context model.")
+
+        os.makedirs("diagnosis_engine/trained_models/distilled/metrics", exist_ok=True)
+        data_collator = DataCollatorForSeq2Seq(self.tokenizer, model=self.model)
+        csv_logger = CSVLoggerCallback(train_log_file="diagnosis_engine/trained_models/distilled/metrics/train_distilled_log.csv", eval_log_file="diagnosis_engine/trained_models/distilled/metrics/eval_distilled_log.csv")
+
+        training_args = Seq2SeqTrainingArguments(
+            output_dir="diagnosis_engine/trained_models/distilled",
+            eval_strategy="epoch",
+            logging_strategy="steps",
+            logging_steps=10,
+            learning_rate=learning_rate,
+            per_device_train_batch_size=32,
+            per_device_eval_batch_size=32,
+            num_train_epochs=num_train_epochs,
+            save_total_limit=2,
+            predict_with_generate=True,
+            fp16=torch.cuda.is_available(),
+            remove_unused_columns=False,
+            report_to="none",
+        )
+
+        trainer = DistillationTrainer(
+            model=self.model,
+            args=training_args,
+            train_dataset=self.train_dataset,
+            eval_dataset=self.test_dataset,
+            tokenizer=self.tokenizer,
+            data_collator=data_collator,
+            callbacks=[csv_logger],
+            teacher_model=self.teacher_model,
+            temperature=temperature,
+            alpha=alpha
+        )
+
+        trainer.train()
+
+    def generate_disease_name(self, patient_description):
+        """Generates a diagnosis without padding the input, which keeps CPU inference cheap"""
+        inputs = self.tokenizer(
+            [patient_description],
+            return_tensors="pt",
+            truncation=True,
+            max_length=256
+        ).to(self.device)
+
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, max_new_tokens=32)
+        return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+
+    def save_model(self, save_path="diagnosis_engine/trained_models/distilled"):
+        """Saves the student model and tokenizer"""
+        super().save_model(save_path)
+
+    def load_model(self, load_path="diagnosis_engine/trained_models/distilled"):
+        """Loads a student model and tokenizer from disk"""
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(load_path).to(self.device)
+        self.tokenizer = AutoTokenizer.from_pretrained(load_path)
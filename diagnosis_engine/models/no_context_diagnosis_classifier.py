@@ -1,10 +1,9 @@
 from datasets import load_dataset
 from diagnosis_engine.csv_logger_callback import CSVLoggerCallback
+from diagnosis_engine.evaluation_engine import EvaluationEngine
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, Seq2SeqTrainingArguments, Seq2SeqTrainer, DataCollatorForSeq2Seq
 import torch
 import os
-import evaluate
-import numpy as np
 
 class NoContextDiagnosisClassifier:
     def __init__(self, model_name="t5-small", dataset_name="QuyenAnhDE/Diseases_Symptoms"):
@@ -77,66 +76,13 @@ class NoContextDiagnosisClassifier:
 
         trainer.train()
 
-    def evaluate(self, compute_metrics=True):
+    def evaluate(self, compute_metrics=True, predictions_path=None):
         """Evaluates the model on the test set and computes final metrics (BLEU, ROUGE, Exact Match)."""
         if self.test_dataset is None:
             raise ValueError("Test dataset not prepared. Call load_local_dataset() and prepare_dataset() first.")
 
-        data_collator = DataCollatorForSeq2Seq(self.tokenizer, model=self.model)
-
-        args = Seq2SeqTrainingArguments(
-            output_dir="./results",
-            per_device_eval_batch_size=16,
-            predict_with_generate=True,
-            report_to="none",
-        )
-
-        if compute_metrics:
-            rouge_metric = evaluate.load("rouge")
-            bleu_metric = evaluate.load("bleu")
-
-            def compute_metrics_fn(eval_pred):
-                predictions, labels = eval_pred
-                decoded_preds = self.tokenizer.batch_decode(predictions, skip_special_tokens=True)
-                decoded_labels = self.tokenizer.batch_decode(
-                    np.where(labels != -100, labels, self.tokenizer.pad_token_id),
-                    skip_special_tokens=True
-                )
-
-                rouge_result = rouge_metric.compute(
-                    predictions=decoded_preds, references=decoded_labels, use_stemmer=True
-                )
-
-                bleu_result = bleu_metric.compute(
-                    predictions=decoded_preds,
-                    references=decoded_labels,
-                )
-
-                exact_matches = np.mean([
-                    int(pred.strip().lower() == label.strip().lower())
-                    for pred, label in zip(decoded_preds, decoded_labels)
-                ])
-
-                result = {
-                    "rougeL": round(rouge_result["rougeL"], 4),
-                    "bleu": round(bleu_result["bleu"], 4),
-                    "exact_match": round(exact_matches, 4)
-                }
-                return result
-        else:
-            compute_metrics_fn = None
-
-        trainer = Seq2SeqTrainer(
-            model=self.model,
-            args=args,
-            eval_dataset=self.test_dataset,
-            tokenizer=self.tokenizer,
-            data_collator=data_collator,
-            compute_metrics=compute_metrics_fn
-        )
-
-        metrics = trainer.evaluate()
-        return metrics
+        engine = EvaluationEngine(self.model, self.tokenizer, self.device)
+        return engine.evaluate(self.test_dataset, compute_metrics=compute_metrics, predictions_path=predictions_path)
 
 
     def save_model(self, save_path="diagnosis_engine/trained_models/no_context"):  
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+class DocumentPipeline:
+    """
+    Runs OCR and medical information extraction for several uploaded files concurrently.
+    Each file is one task (OCR, then extraction as soon as its own OCR finishes), tasks run
+    on a thread pool bounded by max_concurrency, and results come back in input order.
+    With batch_extraction the files are OCRed concurrently first and all texts are then
+    handed to extractor.extract_many, which packs them into as few LLM requests as possible.
+    If the batched extraction fails, each text is extracted on its own so that one bad
+    document only fails its own file.
+    """
+
+    def __init__(self, ocr_engine, extractor, max_concurrency=4, batch_extraction=False):
+        """
+        :param ocr_engine: instance of OCREngine
+        :param extractor: instance of MedicalInfoExtractor
+        :param max_concurrency: maximum number of files in flight against the API
+        :param batch_extraction: extract all texts in one extract_many call instead of one call per file
+        """
+        self.ocr_engine = ocr_engine
+        self.extractor = extractor
+        self.max_concurrency = max_concurrency
+        self.batch_extraction = batch_extraction
+
+    @staticmethod
+    def document_name(document):
+        if isinstance(document, (str, os.PathLike)):
+            return os.path.basename(document)
+        return getattr(document, "filename", None) or getattr(document, "name", None) or "document"
+
+    def process_file(self, document):
+        name = self.document_name(document)
+        try:
+            text = self.ocr_engine.extract_text(document)
+            info = self.extractor.extract(text)
+            return {"file": name, "info": info, "error": None}
+        except Exception as e:
+            return {"file": name, "info": None, "error": str(e)}
+
+    def ocr_file(self, document):
+        name = self.document_name(document)
+        try:
+            return {"file": name, "text": self.ocr_engine.extract_text(document), "error": None}
+        except Exception as e:
+            return {"file": name, "text": None, "error": str(e)}
+
+    def map(self, fn, documents):
+        if len(documents) <= 1 or self.max_concurrency <= 1:
+            return [fn(document) for document in documents]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(documents))) as pool:
+            return list(pool.map(fn, documents))
+
+    def process_batched(self, documents):
+        ocr_results = self.map(self.ocr_file, documents)
+        results = [{"file": r["file"], "info": None, "error": r["error"]} for r in ocr_results]
+        ok = [i for i, r in enumerate(ocr_results) if r["error"] is None]
+        if not ok:
+            return results
+        try:
+            infos = self.extractor.extract_many([ocr_results[i]["text"] for i in ok])
+        except Exception:
+            infos = None
+        if infos is not None:
+            for i, info in zip(ok, infos):
+                results[i]["info"] = info
+            return results
+
+        for i in ok:
+            try:
+                results[i]["info"] = self.extractor.extract(ocr_results[i]["text"])
+            except Exception as e:
+                results[i]["error"] = str(e)
+        return results
+
+    def process(self, documents):
+        """
+        :param documents: file paths or binary file objects (anything OCREngine.extract_text accepts)
+        :return: one dict per document, in input order, with keys file, info and error
+        """
+        documents = list(documents)
+        if self.batch_extraction and hasattr(self.extractor, "extract_many"):
+            return self.process_batched(documents)
+        return self.map(self.process_file, documents)
+
+    @staticmethod
+    def merged_symptoms(results):
+        """Symptoms of all successful files, concatenated in input order."""
+        symptoms = []
+        for result in results:
+            info = result["info"] or {}
+            if info.get("symptoms"):
+                symptoms.extend(info["symptoms"])
+        return symptoms
+
+    @staticmethod
+    def errors(results):
+        return [(r["file"], r["error"]) for r in results if r["error"] is not None]
@@ -0,0 +1,106 @@
+import io
+import logging
+
+try:
+    from PIL import Image, ImageChops, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+class ImagePreprocessor:
+    """
+    Shrinks uploaded images before they are base64-encoded for OCR.
+    Photos of a document are scaled so the page's long side matches target_dpi
+    (assuming an A4 page), converted to grayscale and re-encoded as JPEG or PNG,
+    whichever is smaller. Optionally crops away the uniform background around the page.
+    The original bytes are kept whenever preprocessing would not make them smaller.
+    """
+
+    def __init__(self, target_dpi=200, page_long_inches=11.69, grayscale=True, jpeg_quality=85,
+                 crop=False, crop_tolerance=40, crop_margin=0.02):
+        """
+        :param target_dpi: resolution the page is resampled to; 200-300 is plenty for OCR
+        :param crop: crop to the bounding box of pixels that differ from the corner (background) colour;
+                     off until check_preprocessing_quality has been run on a corpus of real scans
+        :param crop_tolerance: grey-level difference from the background that counts as document
+        :param crop_margin: margin kept around the detected region, as a fraction of its size
+        """
+        self.max_long_side = int(target_dpi * page_long_inches)
+        self.grayscale = grayscale
+        self.jpeg_quality = jpeg_quality
+        self.crop = crop
+        self.crop_tolerance = crop_tolerance
+        self.crop_margin = crop_margin
+
+    @property
+    def available(self):
+        return Image is not None
+
+    @staticmethod
+    def flatten(image):
+        """Composites images with an alpha channel (or palette transparency) onto white."""
+        if image.mode not in ("RGBA", "LA", "PA") and not (image.mode == "P" and "transparency" in image.info):
+            return image
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        return Image.alpha_composite(background, image).convert("RGB")
+
+    def crop_to_document(self, image):
+        gray = image.convert("L")
+        background = Image.new("L", gray.size, gray.getpixel((0, 0)))
+        diff = ImageChops.difference(gray, background).point(lambda v: 255 if v > self.crop_tolerance else 0)
+        box = diff.getbbox()
+        if box is None:
+            return image
+        left, top, right, bottom = box
+        dx = int((right - left) * self.crop_margin)
+        dy = int((bottom - top) * self.crop_margin)
+        return image.crop((max(left - dx, 0), max(top - dy, 0), min(right + dx, image.width), min(bottom + dy, image.height)))
+
+    def encode(self, image):
+        """Encodes as JPEG and PNG and keeps the smaller; returns (bytes, mime)."""
+        candidates = []
+        jpeg = io.BytesIO()
+        image.save(jpeg, format="JPEG", quality=self.jpeg_quality, optimize=True)
+        candidates.append((jpeg.getvalue(), "image/jpeg"))
+        png = io.BytesIO()
+        image.save(png, format="PNG", optimize=True)
+        candidates.append((png.getvalue(), "image/png"))
+        return min(candidates, key=lambda c: len(c[0]))
+
+    def process(self, file_bytes, mime):
+        """
+        :return: (bytes, mime) ready for upload, the input unchanged when it cannot be improved
+        """
+        if not self.available:
+            return file_bytes, mime
+        try:
+            image = Image.open(io.BytesIO(file_bytes))
+            image = ImageOps.exif_transpose(image)
+        except Exception:
+            return file_bytes, mime
+
+        original_size = image.size
+        image = self.flatten(image)
+        if self.crop:
+            image = self.crop_to_document(image)
+
+        scale = self.max_long_side / max(image.size)
+        if scale < 1:
+            image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+
+        if self.grayscale:
+            image = image.convert("L")
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        data, out_mime = self.encode(image)
+        logger.info(
+            "OCR image payload %s %dx%d %d bytes -> %s %dx%d %d bytes (base64 %d -> %d)",
+            mime, *original_size, len(file_bytes), out_mime, *image.size, len(data),
+            4 * -(-len(file_bytes) // 3), 4 * -(-len(data) // 3)
+        )
+        if len(data) >= len(file_bytes):
+            return file_bytes, mime
+        return data, out_mime
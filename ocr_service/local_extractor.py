@@ -0,0 +1,224 @@
+from datetime import date, datetime
+import csv
+import logging
+import re
+import threading
+
+from common.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+SYMPTOMS_PATH = "data/raw/Diseases_Symptoms.csv"
+
+class LocalMedicalInfoExtractor:
+    """
+    Offline extractor returning the same dict shape as MedicalInfoExtractor.
+    Symptoms are matched against a lexicon built from the Diseases_Symptoms "Symptoms" column
+    (a local CSV written by scripts/export_symptom_lexicon.py), compiled into one longest-match
+    trie regex. When the lexicon cannot be built, texts go straight to the fallback. Age (or date of birth) and gender are parsed
+    with regexes. Conditions, allergies and medications are not extracted locally, so the
+    fallback extractor (the LLM), if any, is skipped only when at least min_symptoms distinct
+    symptoms were found and the text has no cue for those fields; otherwise its answer is
+    merged with the local result.
+    """
+
+    # a negation covers the words after it up to the end of its clause
+    NEGATION = re.compile(
+        r"\b(?:no|not|denies|denied|without|negative for)\b"
+        r"(?:(?!\b(?:and|but|reports?|reported|with)\b)[^.,;\n])*$"
+    )
+    OTHER_FIELD_CUES = re.compile(
+        r"\b(?:allerg\w*|medications?|medicines?|meds|prescri\w*|\d+\s*mg|tablets?|capsules?|"
+        r"diagnos\w*|history of|known case|conditions?|taking)\b",
+        re.IGNORECASE
+    )
+    AGE_PATTERNS = [
+        re.compile(r"\bage[d]?\s*[:=]?\s*(\d{1,3})\b", re.IGNORECASE),
+        re.compile(r"\b(\d{1,3})\s*[- ]?(?:years?[- ]old|y/?o|yrs?\b)", re.IGNORECASE),
+    ]
+    DOB_PATTERN = re.compile(
+        r"\b(?:dob|d\.o\.b\.?|date of birth|birth ?date|born)\s*[:=]?\s*(\d{1,4}[./-]\d{1,2}[./-]\d{1,4})",
+        re.IGNORECASE
+    )
+    DOB_FORMATS = ["%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y"]
+    GENDER_FIELD = re.compile(r"\b(?:sex|gender)\s*[:=]?\s*(female|male|f|m|woman|man)\b", re.IGNORECASE)
+    GENDER_WORDS = {
+        "Female": re.compile(r"\b(?:female|woman|mrs)\b", re.IGNORECASE),
+        "Male": re.compile(r"\b(?:male|man|mr)\b", re.IGNORECASE),
+    }
+
+    def __init__(self, symptom_dataset=None, symptoms_path=SYMPTOMS_PATH, fallback=None,
+                 min_symptoms=2, min_phrase_length=3, max_phrase_words=6):
+        """
+        :param symptom_dataset: DataFrame with a Symptoms column, read from symptoms_path when None
+        :param symptoms_path: CSV with a Symptoms column; never downloaded on the request path
+        :param fallback: extractor with an extract(text) method used when the local result is not enough
+        :param min_symptoms: distinct local symptom matches needed to skip the fallback
+        """
+        self.symptom_dataset = symptom_dataset
+        self.symptoms_path = symptoms_path
+        self.fallback = fallback
+        self.min_symptoms = min_symptoms
+        self.min_phrase_length = min_phrase_length
+        self.max_phrase_words = max_phrase_words
+        self.pattern = None
+        self.lexicon_failed = False
+        self.lock = threading.Lock()
+
+    def load_symptoms_column(self):
+        if self.symptom_dataset is not None:
+            return self.symptom_dataset["Symptoms"].dropna().tolist()
+        with open(self.symptoms_path, newline="", encoding="utf-8") as f:
+            return [row["Symptoms"] for row in csv.DictReader(f) if row.get("Symptoms")]
+
+    def normalize_phrase(self, phrase):
+        phrase = re.sub(r"\([^)]*\)", " ", phrase.lower())
+        phrase = re.sub(r"[^\w\s'-]", " ", phrase)
+        phrase = re.sub(r"\s+", " ", phrase).strip()
+        if len(phrase) < self.min_phrase_length or len(phrase.split()) > self.max_phrase_words:
+            return None
+        return phrase
+
+    def build_lexicon(self):
+        """
+        Symptom phrases only: the heuristics keywords (analytes, organs, conditions)
+        would be reported as symptoms and hide the document from the LLM.
+        """
+        phrases = set()
+        for symptoms in self.load_symptoms_column():
+            for phrase in re.split(r"[,;]", str(symptoms)):
+                phrase = self.normalize_phrase(phrase)
+                if phrase:
+                    phrases.add(phrase)
+        return phrases
+
+    def matcher(self):
+        """The compiled lexicon, or None when it could not be built (tried once, then logged)."""
+        if self.pattern is None and not self.lexicon_failed:
+            with self.lock:
+                if self.pattern is None and not self.lexicon_failed:
+                    try:
+                        lexicon = self.build_lexicon()
+                        if not lexicon:
+                            raise ValueError("no symptom phrases found")
+                        self.pattern = KeywordMatcher.compile(lexicon, longest=True, whole_words=True)
+                    except (OSError, KeyError, ValueError) as e:
+                        self.lexicon_failed = True
+                        logger.warning(
+                            "Symptom lexicon unavailable (%s: %s), local extraction disabled; "
+                            "run scripts/export_symptom_lexicon.py to create %s",
+                            type(e).__name__, e, self.symptoms_path
+                        )
+        return self.pattern
+
+    def find_symptoms(self, text):
+        """Lexicon phrases in order of first appearance, skipping negated ones ("denies chest pain")."""
+        pattern = self.matcher()
+        if pattern is None:
+            return []
+        text_lower = text.lower()
+        found = []
+        seen = set()
+        for match in pattern.finditer(text_lower):
+            phrase = match.group(0)
+            if phrase in seen:
+                continue
+            if self.NEGATION.search(text_lower[max(match.start() - 40, 0):match.start()]):
+                continue
+            seen.add(phrase)
+            found.append(phrase)
+        return found
+
+    def find_age(self, text, today=None):
+        today = today or date.today()
+        match = self.DOB_PATTERN.search(text)
+        if match:
+            for fmt in self.DOB_FORMATS:
+                try:
+                    born = datetime.strptime(match.group(1), fmt).date()
+                except ValueError:
+                    continue
+                if born <= today:
+                    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+        for pattern in self.AGE_PATTERNS:
+            match = pattern.search(text)
+            if match and 0 < int(match.group(1)) < 120:
+                return int(match.group(1))
+        return None
+
+    def find_gender(self, text):
+        match = self.GENDER_FIELD.search(text)
+        if match:
+            return "Female" if match.group(1).lower() in ("female", "f", "woman") else "Male"
+        for gender, pattern in self.GENDER_WORDS.items():
+            if pattern.search(text):
+                return gender
+        return "Unknown"
+
+    def extract_local(self, text):
+        text = text or ""
+        return {
+            "age": self.find_age(text),
+            "gender": self.find_gender(text),
+            "symptoms": self.find_symptoms(text),
+            "conditions": [],
+            "allergies": [],
+            "medications": [],
+        }
+
+    def confident(self, text, info):
+        """True when the local result can stand in for the LLM's."""
+        return len(info["symptoms"]) >= self.min_symptoms and not self.OTHER_FIELD_CUES.search(text or "")
+
+    @staticmethod
+    def merge(local, remote):
+        """
+        The fallback's answer completed with the local one: local symptoms come first and
+        the fallback's are added unless already present, age and gender are taken from the
+        fallback when it found them.
+        """
+        info = dict(remote)
+        symptoms = list(local["symptoms"])
+        seen = {symptom.lower() for symptom in symptoms}
+        for symptom in remote.get("symptoms") or []:
+            if str(symptom).lower() not in seen:
+                seen.add(str(symptom).lower())
+                symptoms.append(symptom)
+        info["symptoms"] = symptoms
+        if remote.get("age") is None:
+            info["age"] = local["age"]
+        if remote.get("gender") in (None, "", "Unknown"):
+            info["gender"] = local["gender"]
+        for field in ("conditions", "allergies", "medications"):
+            info[field] = remote.get(field) or []
+        return info
+
+    def extract(self, text: str):
+        if self.fallback is not None and self.matcher() is None:
+            return self.fallback.extract(text)
+        info = self.extract_local(text)
+        if self.fallback is None or self.confident(text, info):
+            return info
+        return self.merge(info, self.fallback.extract(text))
+
+    def extract_many(self, texts):
+        """
+        Same as extract for each text, but the texts that need the fallback go to it
+        together, so an LLM fallback can answer them in batched requests.
+        """
+        if self.fallback is not None and self.matcher() is None:
+            if hasattr(self.fallback, "extract_many"):
+                return self.fallback.extract_many(texts)
+            return [self.fallback.extract(text) for text in texts]
+        results = [self.extract_local(text) for text in texts]
+        if self.fallback is None:
+            return results
+        unsure = [i for i, info in enumerate(results) if not self.confident(texts[i], info)]
+        if unsure:
+            if hasattr(self.fallback, "extract_many"):
+                infos = self.fallback.extract_many([texts[i] for i in unsure])
+            else:
+                infos = [self.fallback.extract(texts[i]) for i in unsure]
+            for i, info in zip(unsure, infos):
+                results[i] = self.merge(results[i], info)
+        return results
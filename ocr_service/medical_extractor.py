@@ -1,12 +1,43 @@
-from mistralai import Mistral
+from ocr_service.mistral_client import get_client
+from ocr_service.resilience import UpstreamUnavailable
 import json
 import re
 
 class MedicalInfoExtractor:
-    def __init__(self, api_key: str):
-        self.client = Mistral(api_key=api_key)
+    # prompt instructions and the JSON answer of one document, counted once per batched document
+    DOCUMENT_OVERHEAD_TOKENS = 80
+    PROMPT_TOKENS = 250
+
+    def __init__(self, api_key: str, cache=None, client=None, model: str = "mistral-large-latest",
+                 caller=None, budget=None, fallback=None, max_batch_tokens=6000):
+        """
+        :param cache: optional ResultCache keyed by the OCR text, so repeat uploads skip the LLM call
+        :param client: Mistral client, the shared pooled one from get_client when None
+        :param caller: optional ResilientCaller shared by all extractors (budget, hedging, circuit breaker)
+        :param budget: seconds allowed per extraction, the caller's default when None
+        :param fallback: callable(text) returning the same dict, used when the upstream is unavailable
+        :param max_batch_tokens: estimated prompt + answer tokens allowed in one extract_many request
+        """
+        self.client = client or get_client(api_key)
+        self.cache = cache
+        self.model = model
+        self.caller = caller
+        self.budget = budget
+        self.fallback = fallback
+        self.max_batch_tokens = max_batch_tokens
 
     def extract(self, text: str):
+        try:
+            if self.cache is None:
+                return self.complete(text)
+            return self.cache.get_or_compute("extraction", self.model, text, lambda: self.complete(text))
+        except UpstreamUnavailable:
+            # fallback results are not cached, the next request tries the LLM again
+            if self.fallback is None:
+                raise
+            return self.fallback(text)
+
+    def complete(self, text: str):
         prompt = f"""
         You are an information extraction assistant.
         Extract the following fields ONLY from the text below:
@@ -32,12 +63,130 @@ class MedicalInfoExtractor:
         }}
         """
 
-        result = self.client.chat.complete(
-            model="mistral-large-latest",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        return self.ask(prompt)
+
+    def ask(self, prompt: str):
+        """Sends one chat request and parses the (possibly fenced) JSON answer."""
+        def request(timeout_ms=None):
+            return self.client.chat.complete(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                timeout_ms=timeout_ms
+            )
+
+        result = request() if self.caller is None else self.caller.call(request, self.budget)
 
         json_raw = result.choices[0].message.content
         json_clean = re.sub(r"^```json\s*|\s*```$", "", json_raw.strip(), flags=re.MULTILINE)
-        info = json.loads(json_clean)
-        return info
+        return json.loads(json_clean)
+
+    @staticmethod
+    def estimate_tokens(text: str):
+        return len(text) // 4 + 1
+
+    def pack(self, texts):
+        """
+        Groups texts into as few requests as fit max_batch_tokens (first-fit decreasing).
+        A text larger than the budget on its own gets a request to itself.
+        :return: lists of indices into texts, each list in input order
+        """
+        room = self.max_batch_tokens - self.PROMPT_TOKENS
+        batches = []
+        order = sorted(range(len(texts)), key=lambda i: self.estimate_tokens(texts[i]), reverse=True)
+        for i in order:
+            cost = self.estimate_tokens(texts[i]) + self.DOCUMENT_OVERHEAD_TOKENS
+            for batch in batches:
+                if batch["tokens"] + cost <= room:
+                    batch["indices"].append(i)
+                    batch["tokens"] += cost
+                    break
+            else:
+                batches.append({"indices": [i], "tokens": cost})
+        return [sorted(batch["indices"]) for batch in batches]
+
+    def complete_many(self, texts):
+        """One request for several documents; returns one dict per text, in order."""
+        documents = "\n".join(
+            f'<document id="{i}">\n{text}\n</document>' for i, text in enumerate(texts, 1)
+        )
+        prompt = f"""
+        You are an information extraction assistant.
+        The text below contains {len(texts)} separate medical documents, each wrapped in
+        <document id="..."></document> tags. Treat every document independently and
+        extract the following fields ONLY from that document:
+
+        - Age (if DOB is present, calculate)
+        - Gender (Male/Female/Unknown)
+        - Symptoms (list of symptom phrases only)
+        - Medical conditions (if listed)
+        - Allergies
+        - Medications
+
+        Documents:
+        {documents}
+
+        Return a JSON array with exactly one object per document:
+        [
+        {{
+        "document": <id>,
+        "age": ...,
+        "gender": "...",
+        "symptoms": [...],
+        "conditions": [...],
+        "allergies": [...],
+        "medications": [...]
+        }}
+        ]
+        """
+
+        answer = self.ask(prompt)
+        by_id = {}
+        for info in answer if isinstance(answer, list) else []:
+            if isinstance(info, dict) and isinstance(info.get("document"), int):
+                by_id[info.pop("document")] = info
+        # a document the model skipped is asked for on its own rather than guessed
+        return [by_id.get(i) or self.complete(text) for i, text in enumerate(texts, 1)]
+
+    def extract_many(self, texts):
+        """
+        Extraction for several OCR texts with as few LLM calls as the token budget allows.
+        Cached texts are not sent, duplicates are sent once, and a batch that cannot be
+        answered (UpstreamUnavailable) goes to the fallback like extract does. A batch whose
+        answer cannot be parsed is retried one document at a time with extract.
+        :return: one dict per text, in input order
+        """
+        texts = list(texts)
+        results = {}
+        keys = {}
+        for text in dict.fromkeys(texts):
+            if self.cache is not None:
+                keys[text] = self.cache.make_key("extraction", self.model, text)
+                cached = self.cache.get("extraction", keys[text])
+                if cached is not None:
+                    results[text] = cached
+
+        pending = [text for text in dict.fromkeys(texts) if text not in results]
+        for batch in self.pack(pending):
+            batch_texts = [pending[i] for i in batch]
+            try:
+                if len(batch_texts) == 1:
+                    infos = [self.complete(batch_texts[0])]
+                else:
+                    infos = self.complete_many(batch_texts)
+            except UpstreamUnavailable:
+                if self.fallback is None:
+                    raise
+                results.update((text, self.fallback(text)) for text in batch_texts)
+                continue
+            except (ValueError, TypeError, AttributeError):
+                # malformed or truncated JSON for the whole batch; json.JSONDecodeError is a ValueError
+                if len(batch_texts) == 1:
+                    raise
+                results.update((text, self.extract(text)) for text in batch_texts)
+                continue
+            for text, info in zip(batch_texts, infos):
+                results[text] = info
+                if self.cache is not None:
+                    self.cache.put(keys[text], info)
+
+        return [results[text] for text in texts]
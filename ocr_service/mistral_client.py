@@ -0,0 +1,43 @@
+import os
+import threading
+import httpx
+from mistralai import Mistral
+
+DEFAULT_TIMEOUT = float(os.getenv("MISTRAL_TIMEOUT", "60"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("MISTRAL_CONNECT_TIMEOUT", "5"))
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("MISTRAL_MAX_CONNECTIONS", "16"))
+
+_clients = {}
+_lock = threading.Lock()
+
+def build_http_client(timeout=DEFAULT_TIMEOUT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                      max_connections=DEFAULT_MAX_CONNECTIONS):
+    """httpx client with a bounded keep-alive pool, so TLS connections are reused across requests."""
+    return httpx.Client(
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        follow_redirects=True,
+    )
+
+def get_client(api_key, server_url=None, timeout=DEFAULT_TIMEOUT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+               max_connections=DEFAULT_MAX_CONNECTIONS):
+    """
+    Returns the process-wide Mistral client for (api_key, server_url), creating it on first use.
+    OCREngine and MedicalInfoExtractor share it, so both use the same connection pool.
+    :param server_url: alternative base URL (e.g. the local stub server), MISTRAL_SERVER_URL when None
+    """
+    server_url = server_url or os.getenv("MISTRAL_SERVER_URL") or None
+    key = (api_key, server_url, timeout, connect_timeout, max_connections)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = Mistral(
+                    api_key=api_key,
+                    server_url=server_url,
+                    client=build_http_client(timeout, connect_timeout, max_connections),
+                    timeout_ms=int(timeout * 1000),
+                )
+                _clients[key] = client
+    return client
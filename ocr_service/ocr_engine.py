@@ -1,25 +1,160 @@
 import base64
-from mistralai import Mistral
+import io
+from concurrent.futures import ThreadPoolExecutor
+from ocr_service.mistral_client import get_client
+from ocr_service.resilience import UpstreamUnavailable
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
 
 class OCREngine:
-    def __init__(self, api_key: str):
-        self.client = Mistral(api_key=api_key)
+    """
+    Turns an uploaded document into text.
+    Plain text is decoded locally, PDFs with an embedded text layer are read with pypdf,
+    and only pages without one go to Mistral OCR, one request per page in parallel.
+    Images are sent as image_url with their real MIME type, downscaled first when a preprocessor is set.
+    """
+
+    MAGIC_BYTES = [
+        (b"%PDF", "application/pdf"),
+        (b"\x89PNG\r\n\x1a\n", "image/png"),
+        (b"\xff\xd8\xff", "image/jpeg"),
+        (b"GIF87a", "image/gif"),
+        (b"GIF89a", "image/gif"),
+        (b"II*\x00", "image/tiff"),
+        (b"MM\x00*", "image/tiff"),
+        (b"PK\x03\x04", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    ]
+
+    def __init__(self, api_key: str, cache=None, client=None, model: str = "mistral-ocr-latest",
+                 page_concurrency: int = 4, min_text_chars: int = 20, preprocessor=None,
+                 caller=None, budget=None):
+        """
+        :param cache: optional ResultCache; identical file bytes are only sent to the API once
+        :param client: Mistral client, the shared pooled one from get_client when None
+        :param page_concurrency: pages of a scanned PDF OCR'd at the same time
+        :param min_text_chars: a PDF page with fewer extractable characters is treated as scanned
+        :param preprocessor: optional ImagePreprocessor applied to images before upload
+        :param caller: optional ResilientCaller shared by all engines (budget, hedging, circuit breaker)
+        :param budget: seconds allowed per OCR request, the caller's default when None
+        """
+        self.client = client or get_client(api_key)
+        self.cache = cache
+        self.model = model
+        self.page_concurrency = page_concurrency
+        self.min_text_chars = min_text_chars
+        self.preprocessor = preprocessor
+        self.caller = caller
+        self.budget = budget
+
+    @classmethod
+    def detect_mime(cls, file_bytes: bytes):
+        for magic, mime in cls.MAGIC_BYTES:
+            if file_bytes.startswith(magic):
+                return mime
+        if file_bytes[:4] == b"RIFF" and file_bytes[8:12] == b"WEBP":
+            return "image/webp"
+        try:
+            file_bytes.decode("utf-8")
+        except UnicodeDecodeError:
+            return "application/octet-stream"
+        return "text/plain"
+
+    @staticmethod
+    def read_source(source):
+        """Accepts a path, raw bytes or a binary file object (read from its current position)."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if hasattr(source, "read"):
+            return source.read()
+        with open(source, "rb") as f:
+            return f.read()
+
+    def extract_text(self, source):
+        """
+        :param source: file path, bytes or binary file object (e.g. an upload spooled in memory)
+        """
+        file_bytes = self.read_source(source)
+
+        try:
+            if self.cache is None:
+                return self.process(file_bytes)
+            return self.cache.get_or_compute("ocr", self.model, file_bytes, lambda: self.process(file_bytes))
+        except UpstreamUnavailable as error:
+            if getattr(error, "partial_text", None):
+                return error.partial_text
+            raise
 
-    def extract_text(self, file_path: str):
-        with open(file_path, "rb") as f:
-            file_bytes = f.read()
+    def process(self, file_bytes: bytes):
+        mime = self.detect_mime(file_bytes)
+        if mime == "text/plain":
+            return file_bytes.decode("utf-8")
+        if mime == "application/pdf":
+            return self.process_pdf(file_bytes)
+        if mime.startswith("image/") and self.preprocessor is not None:
+            file_bytes, mime = self.preprocessor.process(file_bytes, mime)
+        return self.ocr(file_bytes, mime)
+
+    def process_pdf(self, file_bytes: bytes):
+        """Embedded text where a page has it, parallel per-page OCR for the scanned pages."""
+        if PdfReader is None:
+            return self.ocr(file_bytes, "application/pdf")
+        try:
+            reader = PdfReader(io.BytesIO(file_bytes))
+            pages_text = [page.extract_text() or "" for page in reader.pages]
+        except Exception:
+            # encrypted or malformed PDFs are left to the OCR service
+            return self.ocr(file_bytes, "application/pdf")
+
+        scanned = [i for i, text in enumerate(pages_text) if len(text.strip()) < self.min_text_chars]
+        if not scanned:
+            return "\n\n".join(text.strip() for text in pages_text)
+        if len(reader.pages) == 1:
+            return self.ocr(file_bytes, "application/pdf")
+
+        page_pdfs = [self.single_page_pdf(reader, i) for i in scanned]
+        with ThreadPoolExecutor(max_workers=min(self.page_concurrency, len(page_pdfs))) as pool:
+            try:
+                ocr_texts = list(pool.map(lambda pdf: self.ocr(pdf, "application/pdf"), page_pdfs))
+            except UpstreamUnavailable as error:
+                # OCR is down or too slow: hand back the embedded text layer, without caching it
+                if len(scanned) < len(pages_text):
+                    error.partial_text = "\n\n".join(
+                        text.strip() for i, text in enumerate(pages_text) if i not in scanned
+                    )
+                raise
+        for i, text in zip(scanned, ocr_texts):
+            pages_text[i] = text
+
+        return "\n\n".join(text.strip() for text in pages_text)
+
+    @staticmethod
+    def single_page_pdf(reader, index):
+        writer = PdfWriter()
+        writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def ocr(self, file_bytes: bytes, mime: str):
         file_b64 = base64.b64encode(file_bytes).decode("utf-8")
+        data_url = f"data:{mime};base64,{file_b64}"
+        if mime.startswith("image/"):
+            document = {"type": "image_url", "image_url": data_url}
+        else:
+            document = {"type": "document_url", "document_url": data_url}
+
+        def request(timeout_ms=None):
+            return self.client.ocr.process(
+                model=self.model,
+                document=document,
+                include_image_base64=False,
+                timeout_ms=timeout_ms
+            )
 
-        response = self.client.ocr.process(
-            model="mistral-ocr-latest",
-            document={
-                "type": "document_url",
-                "document_url": (
-                    f"data:application/pdf;base64,{file_b64}"
-                )
-            },
-            include_image_base64=False
-        )
+        response = request() if self.caller is None else self.caller.call(request, self.budget)
 
         pages_text = "\n\n".join(p.markdown for p in response.pages)
         return pages_text
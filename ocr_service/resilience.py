@@ -0,0 +1,175 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import threading
+import time
+
+class UpstreamUnavailable(RuntimeError):
+    """Raised when a call cannot be answered within its budget or the circuit is open."""
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)."""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p, min_samples=20):
+        """The p-th percentile, or None until min_samples latencies have been seen."""
+        with self.lock:
+            if len(self.samples) < min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class CircuitBreaker:
+    """
+    Opens when the error rate over the last `window` calls reaches `error_threshold`,
+    rejects calls for `reset_timeout` seconds, then lets a single probe through (half-open):
+    a successful probe closes the circuit again, a failed one re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, error_threshold=0.5, window=20, min_calls=5, reset_timeout=30.0):
+        self.error_threshold = error_threshold
+        self.outcomes = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record(self, success):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                if success:
+                    self.state = self.CLOSED
+                    self.outcomes.clear()
+                else:
+                    self.trip()
+                return
+            self.outcomes.append(success)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= self.min_calls and failures / len(self.outcomes) >= self.error_threshold:
+                self.trip()
+
+    def trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+
+
+class ResilientCaller:
+    """
+    Runs upstream calls under a latency budget with one hedged attempt and a circuit breaker.
+    The first attempt runs alone until it is slower than the hedge_percentile of recent
+    latencies; then a second identical attempt is started and whichever answers first wins.
+    An attempt that fails with a retryable error is replaced by a new one while budget remains.
+    One instance should be shared per upstream endpoint, since it holds the latency
+    history and the breaker state.
+    """
+
+    def __init__(self, name, budget=20.0, hedge_percentile=95, max_attempts=2, min_samples=20,
+                 breaker=None, max_workers=16):
+        """
+        :param budget: default seconds allowed for one logical call, all attempts included
+        :param hedge_percentile: latency percentile after which the hedged attempt is sent
+        :param max_attempts: attempts per call, the first one included
+        :param min_samples: successful calls observed before hedging is enabled
+        """
+        self.name = name
+        self.budget = budget
+        self.hedge_percentile = hedge_percentile
+        self.max_attempts = max_attempts
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+        self.breaker = breaker or CircuitBreaker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-call")
+        self.stats = {"calls": 0, "hedged": 0, "retried": 0, "timeouts": 0, "rejected": 0, "failures": 0}
+
+    @staticmethod
+    def retryable(error):
+        """Client errors (4xx other than 429) are the caller's fault and are neither retried nor counted."""
+        status = getattr(error, "status_code", None)
+        return status is None or status >= 500 or status == 429
+
+    def submit(self, fn, deadline):
+        start = time.monotonic()
+        timeout_ms = max(int((deadline - start) * 1000), 1)
+        future = self.executor.submit(fn, timeout_ms)
+        future.started_at = start
+        return future
+
+    def call(self, fn, budget=None):
+        """
+        :param fn: callable taking timeout_ms (the remaining budget) and performing one attempt
+        :param budget: seconds for this call, the instance default when None
+        :raise UpstreamUnavailable: circuit open, budget exhausted or every attempt failed
+        """
+        self.stats["calls"] += 1
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise UpstreamUnavailable(f"{self.name}: circuit open")
+
+        deadline = time.monotonic() + (budget or self.budget)
+        hedge_after = self.latency.percentile(self.hedge_percentile, self.min_samples)
+        pending = {self.submit(fn, deadline)}
+        attempts = 1
+        last_error = None
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now
+            if hedge_after is not None and attempts < self.max_attempts:
+                timeout = min(timeout, max(hedge_after - (now - min(f.started_at for f in pending)), 0))
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self.latency.record(time.monotonic() - future.started_at)
+                    self.breaker.record(True)
+                    return future.result()
+                if not self.retryable(error):
+                    self.breaker.record(True)
+                    raise error
+                last_error = error
+
+            if attempts < self.max_attempts and time.monotonic() < deadline:
+                if done and not pending:
+                    self.stats["retried"] += 1
+                elif not done and hedge_after is not None:
+                    self.stats["hedged"] += 1
+                else:
+                    continue
+                pending.add(self.submit(fn, deadline))
+                attempts += 1
+
+        self.breaker.record(False)
+        if pending:
+            self.stats["timeouts"] += 1
+            raise UpstreamUnavailable(f"{self.name}: no answer within {budget or self.budget:.1f}s")
+        self.stats["failures"] += 1
+        raise UpstreamUnavailable(f"{self.name}: {last_error}") from last_error
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for OCR and extraction results.
+    Each entry is a small JSON file named after the SHA-256 of its inputs, so the same
+    document uploaded twice maps to the same entry regardless of file name.
+    The directory is bounded to max_bytes; least recently used entries are evicted first.
+    Hits and misses are counted per namespace ("ocr", "extraction") and, with log_every,
+    stats() is logged at INFO every log_every lookups.
+    """
+
+    def __init__(self, cache_dir="data/cache/ocr", max_bytes=256 * 1024 * 1024, log_every=0):
+        """
+        :param log_every: lookups between two stats log lines, 0 disables logging
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.log_every = log_every
+        self.lookups = 0
+        self.lock = threading.Lock()
+        self.index = None
+        self.total_bytes = 0
+        self.counters = {}
+
+    @staticmethod
+    def make_key(namespace, model, payload):
+        """
+        :param payload: bytes (file content) or str (OCR text)
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        digest = hashlib.sha256()
+        digest.update(f"{namespace}\0{model}\0".encode("utf-8"))
+        digest.update(payload)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load_index(self):
+        """Scans the directory once: key -> [size, last access time]."""
+        if self.index is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.index = {}
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    self.index[entry.name[:-5]] = [stat.st_size, stat.st_mtime]
+            self.total_bytes = sum(size for size, _ in self.index.values())
+        return self.index
+
+    def count(self, namespace, hit):
+        hits, misses = self.counters.get(namespace, (0, 0))
+        self.counters[namespace] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+    def get(self, namespace, key):
+        with self.lock:
+            index = self.load_index()
+            value = None
+            if key in index:
+                try:
+                    with open(self.path(key), encoding="utf-8") as f:
+                        value = json.load(f)["value"]
+                    now = time.time()
+                    index[key][1] = now
+                    # the mtime doubles as the LRU timestamp across restarts
+                    os.utime(self.path(key), (now, now))
+                except (OSError, ValueError, KeyError):
+                    self.discard(key)
+                    value = None
+            self.count(namespace, value is not None)
+            self.lookups += 1
+            should_log = self.log_every and self.lookups % self.log_every == 0
+        if should_log:
+            logger.info("OCR result cache after %d lookups: %s", self.lookups, self.stats())
+        return value
+
+    def put(self, key, value):
+        data = json.dumps({"value": value}, ensure_ascii=False).encode("utf-8")
+        with self.lock:
+            index = self.load_index()
+            tmp_path = f"{self.path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+
+            if key in index:
+                self.total_bytes -= index[key][0]
+            index[key] = [len(data), time.time()]
+            self.total_bytes += len(data)
+            self.evict()
+
+    def discard(self, key):
+        size, _ = self.index.pop(key, (0, 0))
+        self.total_bytes -= size
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self.index.items(), key=lambda item: item[1][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.discard(key)
+
+    def get_or_compute(self, namespace, model, payload, compute):
+        """Returns the cached value for (namespace, model, payload) or computes and stores it."""
+        key = self.make_key(namespace, model, payload)
+        value = self.get(namespace, key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self.lock:
+            index = self.load_index()
+            result = {
+                namespace: {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+                for namespace, (hits, misses) in self.counters.items()
+            }
+            result["entries"] = len(index)
+            result["bytes"] = self.total_bytes
+            return result
@@ -0,0 +1,269 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+SYMPTOM_POOL = [
+    "fever", "cough", "fatigue", "headache", "nausea", "dizziness", "shortness of breath",
+    "chest pain", "sore throat", "runny nose", "rash", "joint pain", "abdominal pain", "vomiting",
+]
+
+
+class LatencyModel:
+    """
+    Response time distribution of one endpoint, in seconds.
+    kind is constant (mean), uniform (mean +- spread), normal (mean, sd=spread) or
+    lognormal (median=mean, sigma=spread). With tail_probability a request takes
+    tail_latency instead, and per_page adds time for every OCR page after the first.
+    """
+
+    KINDS = ("constant", "uniform", "normal", "lognormal")
+
+    def __init__(self, kind="constant", mean=0.0, spread=0.0, tail_probability=0.0, tail_latency=0.0, per_page=0.0):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+        self.tail_probability = tail_probability
+        self.tail_latency = tail_latency
+        self.per_page = per_page
+
+    @classmethod
+    def parse(cls, spec):
+        """'lognormal:0.8:0.4' -> LatencyModel("lognormal", 0.8, 0.4); a bare number is constant."""
+        kind, *params = str(spec).split(":")
+        if kind not in cls.KINDS:
+            return cls("constant", float(kind))
+        return cls(kind, *map(float, params))
+
+    def sample(self, rng, pages=1):
+        if self.tail_probability and rng.random() < self.tail_probability:
+            base = self.tail_latency
+        elif self.kind == "uniform":
+            base = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "normal":
+            base = rng.gauss(self.mean, self.spread)
+        elif self.kind == "lognormal":
+            base = self.mean * math.exp(rng.gauss(0, self.spread))
+        else:
+            base = self.mean
+        return max(base, 0.0) + self.per_page * max(pages - 1, 0)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Implements POST /v1/ocr and POST /v1/chat/completions with the response schema the
+    mistralai SDK expects, plus GET /stats. OCR returns one markdown page per PDF page,
+    chat returns a fenced JSON extraction of the known symptoms found in the prompt text,
+    or a JSON array with one extraction per <document id="N"> block for batched prompts.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately; without this Nagle adds ~40 ms per keep-alive response
+    disable_nagle_algorithm = True
+    ROUTES = {"/v1/ocr": "ocr", "/v1/chat/completions": "chat"}
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.server.stand_in.stats())
+        else:
+            self.send_json(404, {"message": "Not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+        stand_in = self.server.stand_in
+        endpoint = self.ROUTES.get(self.path)
+        if endpoint is None:
+            self.send_json(404, {"message": "Not found"})
+            return
+
+        try:
+            body = json.loads(raw or b"{}")
+            status, payload, pages = (self.ocr if endpoint == "ocr" else self.chat)(body)
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload, pages = 422, {"detail": [{"msg": str(e), "type": "value_error"}]}, 1
+
+        config = stand_in.endpoints[endpoint]
+        time.sleep(stand_in.sample_latency(endpoint, pages))
+        if status == 200 and config["error_rate"] and stand_in.draw() < config["error_rate"]:
+            status, payload = config["error_status"], {"message": "stand-in: injected upstream error"}
+
+        stand_in.count(endpoint, status)
+        self.send_json(status, payload)
+
+    @staticmethod
+    def decode_data_url(url):
+        match = re.match(r"data:([^;,]+)?(;base64)?,(.*)", url, re.DOTALL)
+        if match is None:
+            raise ValueError("Only data: URLs are supported by the stand-in")
+        data = match.group(3)
+        return match.group(1) or "", base64.b64decode(data) if match.group(2) else data.encode("utf-8")
+
+    @staticmethod
+    def page_text(digest, index):
+        rng = random.Random(digest + index)
+        symptoms = rng.sample(SYMPTOM_POOL, 2)
+        return f"## Page {index + 1}\n\nPatient is a {rng.randint(18, 90)}-year-old. Reports {symptoms[0]} and {symptoms[1]}."
+
+    def ocr(self, body):
+        model = body["model"]
+        document = body["document"]
+        kind = document.get("type")
+        if kind not in ("document_url", "image_url"):
+            raise ValueError(f"Unsupported document type: {kind}")
+        url = document[kind] if isinstance(document[kind], str) else document[kind]["url"]
+        mime, file_bytes = self.decode_data_url(url)
+
+        pages = 1
+        if mime == "application/pdf":
+            pages = max(len(re.findall(rb"/Type\s*/Page\b(?!s)", file_bytes)), 1)
+        digest = int(hashlib.sha256(file_bytes).hexdigest()[:8], 16)
+        payload = {
+            "model": model,
+            "pages": [
+                {"index": i, "markdown": self.page_text(digest, i), "images": [], "dimensions": None}
+                for i in range(pages)
+            ],
+            "usage_info": {"pages_processed": pages, "doc_size_bytes": len(file_bytes)},
+        }
+        return 200, payload, pages
+
+    @staticmethod
+    def extract_info(text):
+        text = text.lower()
+        age = re.search(r"(\d{1,3})-year-old", text)
+        return {
+            "age": int(age.group(1)) if age else None,
+            "gender": "Unknown",
+            "symptoms": [s for s in SYMPTOM_POOL if s in text],
+            "conditions": [],
+            "allergies": [],
+            "medications": [],
+        }
+
+    def chat(self, body):
+        model = body["model"]
+        messages = body["messages"]
+        if not messages:
+            raise ValueError("messages must not be empty")
+        prompt = messages[-1]["content"]
+        documents = re.findall(r'<document id="(\d+)">(.*?)</document>', prompt, re.DOTALL)
+        if documents:
+            answer = [{"document": int(i), **self.extract_info(text)} for i, text in documents]
+        else:
+            answer = self.extract_info(prompt.split("Text:", 1)[-1])
+        content = f"```json\n{json.dumps(answer)}\n```"
+        prompt_tokens = len(prompt) // 4
+        payload = {
+            "id": f"stand-in-{time.time_ns()}", "object": "chat.completion", "model": model,
+            "created": int(time.time()),
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                      "total_tokens": prompt_tokens + len(content) // 4},
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        }
+        return 200, payload, 1
+
+
+class StubServer:
+    """
+    Local stand-in for the Mistral OCR and chat endpoints, for benchmarks and regression tests
+    of ocr_service without the real API. Latency distribution and injected error rate are
+    configurable per endpoint and can be changed while the server runs.
+    Point the clients at it with server_url=stub.url (or MISTRAL_SERVER_URL).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, error_status=503, seed=None):
+        """
+        :param port: 0 picks a free port
+        :param latency: default for both endpoints: seconds, a callable returning seconds, or a LatencyModel
+        :param error_rate: default share of valid requests answered with error_status
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stand_in = self
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.endpoints = {
+            name: {"latency": latency, "error_rate": error_rate, "error_status": error_status}
+            for name in ("ocr", "chat")
+        }
+        self.thread = None
+
+    def configure(self, endpoint, latency=None, error_rate=None, error_status=None):
+        """
+        :param endpoint: "ocr", "chat" or "all"
+        """
+        for name in (("ocr", "chat") if endpoint == "all" else (endpoint,)):
+            config = self.endpoints[name]
+            if latency is not None:
+                config["latency"] = latency
+            if error_rate is not None:
+                config["error_rate"] = error_rate
+            if error_status is not None:
+                config["error_status"] = error_status
+        return self
+
+    def draw(self):
+        with self.lock:
+            return self.rng.random()
+
+    def sample_latency(self, endpoint, pages=1):
+        latency = self.endpoints[endpoint]["latency"]
+        if isinstance(latency, LatencyModel):
+            with self.lock:
+                return latency.sample(self.rng, pages)
+        return latency() if callable(latency) else latency
+
+    def count(self, endpoint, status):
+        with self.lock:
+            counter = self.counters.setdefault(endpoint, {})
+            counter[status] = counter.get(status, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            return {endpoint: {str(status): n for status, n in counter.items()} for endpoint, counter in self.counters.items()}
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+OCR_LATENCY = "lognormal:0.8:0.35"
+CHAT_LATENCY = "lognormal:1.5:0.4"
+ERROR_RATE = 0.0
+
+if __name__ == "__main__":
+    server = StubServer(port=8089, error_rate=ERROR_RATE)
+    server.configure("ocr", latency=LatencyModel.parse(OCR_LATENCY))
+    server.configure("chat", latency=LatencyModel.parse(CHAT_LATENCY))
+    print(f"Mistral stand-in listening on {server.url} (set MISTRAL_SERVER_URL to use it)")
+    server.httpd.serve_forever()
@@ -0,0 +1,74 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data.dataset_builder import DatasetBuilder
+
+SIZES = [100_000, 1_000_000, 10_000_000]
+SYMPTOM_COLUMNS = ["Fever", "Cough", "Fatigue", "Difficulty Breathing"]
+
+def legacy_build_input_text(df):
+    """Row-wise reference implementation the vectorized builder must match byte for byte."""
+    def make_text(row):
+        ctx = f"The patient is a {row['Age']}-year-old {row['Gender'].lower()}."
+        bp = str(row.get("Blood Pressure", "")).lower()
+        if "high" in bp:
+            ctx += " The patient has high blood pressure."
+        elif "low" in bp:
+            ctx += " The patient has low blood pressure."
+        else:
+            ctx += f" The patient has normal blood pressure."
+
+        chol = str(row.get("Cholesterol Level", "")).lower()
+        if "high" in chol:
+            ctx += " The patient has high cholesterol."
+        elif "low" in chol:
+            ctx += " The patient has low cholesterol."
+        else:
+            ctx += " The patient has normal cholesterol."
+
+        symp = row.get("Symptoms", "").strip().lower()
+        return ctx + " Reported symptoms include " + symp + "."
+
+    df = df.copy()
+    df["input_text"] = df.apply(make_text, axis=1)
+    df["target"] = df["Disease"]
+    return df[["input_text", "target"]]
+
+def base_profiles():
+    df = pd.read_csv("data/raw/Disease_symptom_and_patient_profile_dataset.csv")
+    flags = df[SYMPTOM_COLUMNS].eq("Yes").to_numpy()
+    df["Symptoms"] = [
+        " " + ", ".join(c.lower() for c, f in zip(SYMPTOM_COLUMNS, row) if f) + " " for row in flags
+    ]
+    return df[["Disease", "Symptoms", "Age", "Gender", "Blood Pressure", "Cholesterol Level"]]
+
+def scaled(df, n_rows):
+    idx = np.resize(np.arange(len(df)), n_rows)
+    return df.iloc[idx].reset_index(drop=True)
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    base = base_profiles()
+
+    sample = scaled(base, 5_000)
+    expected = legacy_build_input_text(sample)
+    actual = DatasetBuilder.build_input_text(sample)
+    assert expected.to_csv(index=False) == actual.to_csv(index=False), "vectorized output differs from legacy"
+    print("Output identical to the row-wise implementation.")
+
+    for n_rows in sizes:
+        df = scaled(base, n_rows)
+        _, vectorized = timed(DatasetBuilder.build_input_text, df)
+        line = f"{n_rows:>12,} rows  vectorized {vectorized:8.2f}s"
+        if n_rows <= 1_000_000:
+            _, legacy = timed(legacy_build_input_text, df)
+            line += f"  row-wise {legacy:8.2f}s  speedup {legacy / vectorized:6.1f}x"
+        print(line)
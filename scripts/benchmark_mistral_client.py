@@ -0,0 +1,58 @@
+import os
+import statistics
+import sys
+import time
+
+from mistralai import Mistral
+from PIL import Image, ImageDraw
+
+from ocr_service.medical_extractor import MedicalInfoExtractor
+from ocr_service.mistral_client import get_client
+from ocr_service.ocr_engine import OCREngine
+from ocr_service.stub_server import StubServer
+
+N_REQUESTS = 200
+STUB_LATENCY = 0.005
+
+def scanned_page(path):
+    """A real PNG page, so extract_text goes straight to OCR without a PDF parse."""
+    image = Image.new("L", (850, 1100), 255)
+    ImageDraw.Draw(image).text((60, 60), "Patient is a 45-year-old. Reports fever and cough.", fill=0)
+    image.save(path, format="PNG")
+
+def fresh_client(server_url):
+    """Old behaviour: a new Mistral client (and connection pool) per request."""
+    return Mistral(api_key="stub", server_url=server_url)
+
+def shared_client(server_url):
+    return get_client("stub", server_url=server_url)
+
+def run(make_client, server_url, file_path, n_requests):
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client = make_client(server_url)
+        text = OCREngine("stub", client=client).extract_text(file_path)
+        MedicalInfoExtractor("stub", client=client).extract(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+    }
+
+if __name__ == "__main__":
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else N_REQUESTS
+    file_path = "data/cache/benchmark_document.png"
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    scanned_page(file_path)
+
+    stub = StubServer(latency=STUB_LATENCY).start()
+    try:
+        # warm up imports and the shared pool
+        run(shared_client, stub.url, file_path, 5)
+        for name, make_client in (("per-request client", fresh_client), ("shared pooled client", shared_client)):
+            print(name, run(make_client, stub.url, file_path, n_requests))
+    finally:
+        stub.stop()
@@ -0,0 +1,87 @@
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw
+
+from ocr_service.document_pipeline import DocumentPipeline
+from ocr_service.medical_extractor import MedicalInfoExtractor
+from ocr_service.mistral_client import get_client
+from ocr_service.ocr_engine import OCREngine
+from ocr_service.resilience import ResilientCaller
+from ocr_service.stub_server import LatencyModel, StubServer
+
+CONCURRENCY_LEVELS = [1, 4, 16]
+REQUESTS_PER_LEVEL = 40
+FILES_PER_REQUEST = 3
+PAGES_PER_DOCUMENT = 2
+OCR_MAX_CONCURRENCY = 4
+OCR_LATENCY = LatencyModel("lognormal", 0.3, 0.35, per_page=0.1)
+CHAT_LATENCY = LatencyModel("lognormal", 0.5, 0.4, tail_probability=0.02, tail_latency=3.0)
+ERROR_RATE = 0.01
+USE_RESILIENCE = True
+BATCH_EXTRACTION = False
+
+def scanned_pdf(seed, pages):
+    """Image-only PDF, so every page goes through OCR."""
+    images = []
+    for page in range(pages):
+        image = Image.new("L", (850, 1100), 255)
+        ImageDraw.Draw(image).text((60, 60), f"Scanned report {seed} page {page}", fill=0)
+        images.append(image)
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+def run_level(pipeline, documents, concurrency, n_requests):
+    def request(i):
+        files = [documents[(i * FILES_PER_REQUEST + k) % len(documents)] for k in range(FILES_PER_REQUEST)]
+        start = time.perf_counter()
+        results = pipeline.process(files)
+        return time.perf_counter() - start, sum(r["error"] is not None for r in results)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(request, range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in outcomes]
+    return {
+        "concurrency": concurrency,
+        "requests_per_sec": round(n_requests / elapsed, 2),
+        "documents_per_sec": round(n_requests * FILES_PER_REQUEST / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000),
+        "p95_ms": round(percentile(latencies, 95) * 1000),
+        "p99_ms": round(percentile(latencies, 99) * 1000),
+        "failed_documents": sum(errors for _, errors in outcomes),
+    }
+
+if __name__ == "__main__":
+    levels = [int(c) for c in sys.argv[1].split(",")] if len(sys.argv) > 1 else CONCURRENCY_LEVELS
+    n_requests = int(sys.argv[2]) if len(sys.argv) > 2 else REQUESTS_PER_LEVEL
+    batch_extraction = sys.argv[3] == "batch" if len(sys.argv) > 3 else BATCH_EXTRACTION
+
+    stub = StubServer(error_rate=ERROR_RATE, seed=42).start()
+    stub.configure("ocr", latency=OCR_LATENCY).configure("chat", latency=CHAT_LATENCY)
+    try:
+        client = get_client("stand-in", server_url=stub.url, max_connections=128)
+        ocr_caller = ResilientCaller("ocr", budget=10.0, max_workers=128) if USE_RESILIENCE else None
+        chat_caller = ResilientCaller("extraction", budget=10.0, max_workers=128) if USE_RESILIENCE else None
+        ocr = OCREngine("stand-in", client=client, caller=ocr_caller)
+        extractor = MedicalInfoExtractor("stand-in", client=client, caller=chat_caller)
+        pipeline = DocumentPipeline(ocr, extractor, max_concurrency=OCR_MAX_CONCURRENCY,
+                                    batch_extraction=batch_extraction)
+
+        documents = [scanned_pdf(i, PAGES_PER_DOCUMENT) for i in range(32)]
+        for concurrency in levels:
+            print(run_level(pipeline, documents, concurrency, n_requests))
+        print("stand-in responses:", stub.stats())
+        if USE_RESILIENCE:
+            print("ocr:", ocr_caller.stats, "extraction:", chat_caller.stats)
+    finally:
+        stub.stop()
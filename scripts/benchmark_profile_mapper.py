@@ -0,0 +1,37 @@
+import sys
+import time
+
+import pandas as pd
+
+from synthetic_data.profile_mapper import ProfileMapper
+
+KAGGLE_CSV = "data/raw/Disease_symptom_and_patient_profile_dataset.csv"
+SCALE = 100
+
+def per_row_matches(mapper):
+    """Reference path: one extractOne call per Kaggle row."""
+    return mapper.df_kaggle["disease_norm"].apply(mapper.find_closest_disease)
+
+def matrix_matches(mapper):
+    matches = {name: matched for name, (matched, _) in mapper.match_table().items()}
+    return mapper.df_kaggle["disease_norm"].map(matches)
+
+def timed(fn, mapper):
+    start = time.perf_counter()
+    out = fn(mapper)
+    return out, time.perf_counter() - start
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else SCALE
+
+    mapper = ProfileMapper(KAGGLE_CSV)
+    mapper.df_kaggle = pd.concat([mapper.df_kaggle] * scale, ignore_index=True)
+    print(f"{len(mapper.df_kaggle):,} Kaggle rows, {mapper.df_kaggle['disease_norm'].nunique()} distinct names, "
+          f"{len(mapper.sym_norm_list):,} candidate diseases")
+
+    expected, per_row = timed(per_row_matches, mapper)
+    actual, matrix = timed(matrix_matches, mapper)
+
+    assert expected.fillna("").equals(actual.fillna("")), "cdist matching differs from extractOne"
+    print(f"per-row extractOne {per_row:8.3f}s")
+    print(f"dedup + cdist      {matrix:8.3f}s  speedup {per_row / matrix:6.1f}x")
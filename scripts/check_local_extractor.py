@@ -0,0 +1,62 @@
+import sys
+
+import pandas as pd
+
+from ocr_service.local_extractor import LocalMedicalInfoExtractor
+
+# a small offline lexicon, so the check does not need the Diseases_Symptoms download
+SYMPTOMS = pd.DataFrame({"Symptoms": [
+    "fever, cough, fatigue",
+    "headache, nausea, dizziness",
+    "chest pain, shortness of breath",
+    "rash, itching",
+]})
+
+# (text, expected symptoms)
+SYMPTOM_CASES = [
+    ("Patient has no fever, reports cough and headache.", ["cough", "headache"]),
+    ("Denies chest pain. Complains of fatigue and nausea.", ["fatigue", "nausea"]),
+    ("No fever or rash; itching since Monday.", ["itching"]),
+    ("Without dizziness but with headache.", ["headache"]),
+    ("Lipid panel: total cholesterol 240, LDL 160, HDL 40, triglycerides 180. Kidney and thyroid normal.", []),
+]
+
+class RecordingFallback:
+    """Stands in for the LLM extractor and records which texts reached it."""
+
+    def __init__(self):
+        self.texts = []
+
+    def extract(self, text):
+        self.texts.append(text)
+        return {"age": 54, "gender": "Female", "symptoms": ["Cough", "wheezing"],
+                "conditions": ["asthma"], "allergies": ["penicillin"], "medications": []}
+
+if __name__ == "__main__":
+    fallback = RecordingFallback()
+    extractor = LocalMedicalInfoExtractor(symptom_dataset=SYMPTOMS, fallback=fallback)
+    failures = []
+
+    for text, expected in SYMPTOM_CASES:
+        found = extractor.extract_local(text)["symptoms"]
+        if found != expected:
+            failures.append(f"{text!r}: expected {expected}, got {found}")
+
+    confident = "Reports fever, cough and headache for three days."
+    if extractor.extract(confident)["symptoms"] != ["fever", "cough", "headache"] or fallback.texts:
+        failures.append("three local symptoms without other cues should not reach the fallback")
+
+    merged = extractor.extract("Fever and cough. Allergic to penicillin.")
+    if fallback.texts[-1:] != ["Fever and cough. Allergic to penicillin."]:
+        failures.append("an allergy cue should send the text to the fallback")
+    elif merged["symptoms"] != ["fever", "cough", "wheezing"] or merged["allergies"] != ["penicillin"]:
+        failures.append(f"fallback answer not merged with the local one: {merged}")
+
+    single = extractor.extract_many(["Mild headache only."])[0]
+    if single["conditions"] != ["asthma"] or single["symptoms"][0] != "headache":
+        failures.append(f"a single local symptom should be completed by the fallback: {single}")
+
+    for failure in failures:
+        print("FAIL", failure)
+    print(f"{len(SYMPTOM_CASES) + 3 - len(failures)} / {len(SYMPTOM_CASES) + 3} checks passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,51 @@
+import glob
+import os
+import re
+import sys
+
+from dotenv import load_dotenv
+from rapidfuzz import fuzz
+
+from ocr_service.image_preprocessor import ImagePreprocessor
+from ocr_service.ocr_engine import OCREngine
+
+SAMPLE_DIR = "data/samples/ocr"
+MIN_SIMILARITY = 95
+# pass "crop" as the second argument to also validate auto-cropping
+CROP = False
+
+def normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+if __name__ == "__main__":
+    load_dotenv()
+    sample_dir = sys.argv[1] if len(sys.argv) > 1 else SAMPLE_DIR
+    crop = sys.argv[2] == "crop" if len(sys.argv) > 2 else CROP
+    paths = sorted(p for p in glob.glob(os.path.join(sample_dir, "*")) if os.path.isfile(p))
+    if not paths:
+        sys.exit(f"No sample documents in {sample_dir}")
+
+    api_key = os.getenv("MISTRAL_API_KEY")
+    preprocessor = ImagePreprocessor(target_dpi=200, crop=crop)
+    baseline = OCREngine(api_key)
+    preprocessed = OCREngine(api_key, preprocessor=preprocessor)
+
+    scores = []
+    for path in paths:
+        with open(path, "rb") as f:
+            file_bytes = f.read()
+        mime = OCREngine.detect_mime(file_bytes)
+        if not mime.startswith("image/"):
+            continue
+        small_bytes, _ = preprocessor.process(file_bytes, mime)
+
+        score = fuzz.ratio(normalize(baseline.extract_text(file_bytes)), normalize(preprocessed.extract_text(file_bytes)))
+        scores.append(score)
+        print(f"{os.path.basename(path)}: {len(file_bytes):,} -> {len(small_bytes):,} bytes, text similarity {score:.1f}")
+
+    if not scores:
+        sys.exit(f"No images in {sample_dir}")
+    worst = min(scores)
+    print(f"{len(scores)} images, mean similarity {sum(scores) / len(scores):.1f}, worst {worst:.1f}")
+    if worst < MIN_SIMILARITY:
+        sys.exit(f"OCR text degraded below {MIN_SIMILARITY} on at least one sample")
@@ -0,0 +1,51 @@
+import random
+import time
+
+from ocr_service.medical_extractor import MedicalInfoExtractor
+from ocr_service.mistral_client import get_client
+from ocr_service.resilience import ResilientCaller, CircuitBreaker
+from ocr_service.stub_server import StubServer
+
+N_REQUESTS = 200
+TEXT = "Patient reports fever and cough."
+
+def tail_latency(seed=0, p_slow=0.05, fast=0.02, slow=1.5):
+    rng = random.Random(seed)
+    return lambda: slow if rng.random() < p_slow else fast
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    pick = lambda p: round(latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)] * 1000, 1)
+    return {"p50_ms": pick(50), "p95_ms": pick(95), "p99_ms": pick(99), "max_ms": round(latencies[-1] * 1000, 1)}
+
+def run(extractor, n_requests):
+    latencies, fallbacks = [], 0
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        info = extractor.extract(TEXT)
+        latencies.append(time.perf_counter() - start)
+        fallbacks += info.get("source") == "fallback"
+    return summarize(latencies), fallbacks
+
+if __name__ == "__main__":
+    fallback = lambda text: {"age": None, "gender": "Unknown", "symptoms": [], "source": "fallback"}
+
+    stub = StubServer(latency=tail_latency()).start()
+    try:
+        client = get_client("stub", server_url=stub.url)
+        plain = MedicalInfoExtractor("stub", client=client)
+        print("tail latency, no policy:", run(plain, N_REQUESTS)[0])
+
+        stub.configure("all", latency=tail_latency())
+        caller = ResilientCaller("extraction", budget=5.0)
+        hedged = MedicalInfoExtractor("stub", client=client, caller=caller, fallback=fallback)
+        print("tail latency, hedged:   ", run(hedged, N_REQUESTS)[0], caller.stats)
+
+        # upstream outage: every request fails, the breaker opens and the fallback answers immediately
+        stub.configure("all", latency=0.02, error_rate=1.0)
+        caller = ResilientCaller("extraction", budget=5.0, breaker=CircuitBreaker(reset_timeout=60))
+        guarded = MedicalInfoExtractor("stub", client=client, caller=caller, fallback=fallback)
+        summary, fallbacks = run(guarded, 50)
+        print("outage, circuit breaker:", summary, f"fallbacks={fallbacks}", f"breaker={caller.breaker.state}", caller.stats)
+    finally:
+        stub.stop()
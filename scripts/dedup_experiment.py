@@ -0,0 +1,46 @@
+import time
+
+import pandas as pd
+from datasets import Dataset
+
+from diagnosis_engine.models.context_diagnosis_classifier import ContextDiagnosisClassifier
+from synthetic_data.deduplicator import NearDuplicateRemover
+
+DATASET_PATH = "data/synthetic/final_training_dataset.csv"
+NUM_TRAIN_EPOCHS = 5
+
+def tokenize(classifier, df):
+    dataset = Dataset.from_pandas(df.reset_index(drop=True))
+    return dataset.map(classifier.preprocess_data, batched=True, remove_columns=dataset.column_names)
+
+def run(name, train_df, test_df):
+    """Trains a fresh model on train_df and evaluates it on the shared test split."""
+    classifier = ContextDiagnosisClassifier()
+    classifier.train_dataset = tokenize(classifier, train_df)
+    classifier.test_dataset = tokenize(classifier, test_df)
+
+    start = time.perf_counter()
+    classifier.train(
+        num_train_epochs=NUM_TRAIN_EPOCHS,
+        output_dir=f"diagnosis_engine/trained_models/sweep/dedup_{name}",
+        save_checkpoints=False
+    )
+    train_seconds = time.perf_counter() - start
+    metrics = classifier.evaluate(compute_metrics=False)
+    return {"run": name, "train_rows": len(train_df), "train_seconds": round(train_seconds, 1), "exact_match": metrics["eval_exact_match"]}
+
+if __name__ == "__main__":
+    df = pd.read_csv(DATASET_PATH)
+    split = Dataset.from_pandas(df).train_test_split(test_size=0.2, seed=42)
+    train_df = split["train"].to_pandas()
+    test_df = split["test"].to_pandas()
+
+    # only the training split is deduplicated so both runs are scored on the same examples
+    deduped_df, report = NearDuplicateRemover().remove(train_df)
+    print("Deduplication:", report)
+
+    results = [run("full", train_df, test_df), run("deduplicated", deduped_df, test_df)]
+    for row in results:
+        print(row)
+    print(f"Training time ratio: {results[1]['train_seconds'] / results[0]['train_seconds']:.2f}, "
+          f"exact match delta: {results[1]['exact_match'] - results[0]['exact_match']:+.4f}")
@@ -0,0 +1,19 @@
+from diagnosis_engine.models.distilled_diagnosis_classifier import DistilledDiagnosisClassifier
+
+model = DistilledDiagnosisClassifier(
+    teacher_path="diagnosis_engine/trained_models/context",
+    dataset_path="data/synthetic/final_training_dataset.csv"
+)
+
+teacher_params = sum(p.numel() for p in model.teacher_model.parameters())
+student_params = sum(p.numel() for p in model.model.parameters())
+print(f"Teacher: {teacher_params:,} params, student: {student_params:,} params ({teacher_params / student_params:.1f}x smaller)")
+
+model.load_local_dataset()
+model.prepare_dataset()
+
+model.train(num_train_epochs=10)
+
+print("Student evaluation:", model.evaluate())
+
+model.save_model()
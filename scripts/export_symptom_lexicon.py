@@ -0,0 +1,14 @@
+import os
+
+from datasets import load_dataset
+
+from ocr_service.local_extractor import SYMPTOMS_PATH
+
+# the web app's LocalMedicalInfoExtractor reads this file instead of downloading the dataset per process
+OUTPUT_PATH = SYMPTOMS_PATH
+
+if __name__ == "__main__":
+    symptoms = load_dataset("QuyenAnhDE/Diseases_Symptoms")["train"].to_pandas()[["Name", "Symptoms"]]
+    os.makedirs(os.path.dirname(OUTPUT_PATH) or ".", exist_ok=True)
+    symptoms.to_csv(OUTPUT_PATH, index=False)
+    print(f"Wrote {len(symptoms)} rows to {OUTPUT_PATH}")
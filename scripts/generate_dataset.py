@@ -1,12 +1,37 @@
 from synthetic_data.patient_profile_factory import PatientProfileFactory
 from synthetic_data.profile_mapper import ProfileMapper
 from synthetic_data.dataset_builder import DatasetBuilder
+from synthetic_data.generation_engine import ParallelDatasetGenerator
+from synthetic_data.streaming_writer import StreamingDatasetWriter
+from synthetic_data.match_cache import MatchCache
+from synthetic_data.deduplicator import NearDuplicateRemover
 import csv
+import os
 
-mapper = ProfileMapper("data/raw/Disease_symptom_and_patient_profile_dataset.csv")
-factory = PatientProfileFactory(n_versions=5)
+SEED = 42
+N_WORKERS = os.cpu_count() or 1
+N_SYNTHETIC_VERSIONS = 5
 
-builder = DatasetBuilder(mapper, factory)
-final_dataset = builder.build(n_synthetic_versions=5)
+# Streaming mode writes row groups incrementally with a bounded-memory shuffle;
+# use a .parquet OUTPUT_PATH to train directly from Parquet.
+STREAMING = False
+# Drops exact and near-duplicate rows before writing (in-memory mode only).
+DEDUPLICATE = False
+OUTPUT_PATH = "data/synthetic/final_training_dataset.csv"
 
-final_dataset.to_csv("data/synthetic/final_training_dataset.csv", index=False, quoting=csv.QUOTE_ALL)
\ No newline at end of file
+if __name__ == "__main__":
+    mapper = ProfileMapper("data/raw/Disease_symptom_and_patient_profile_dataset.csv", cache=MatchCache())
+    factory = PatientProfileFactory(n_versions=N_SYNTHETIC_VERSIONS)
+
+    builder = DatasetBuilder(mapper, factory)
+    generator = ParallelDatasetGenerator(builder, seed=SEED, n_workers=N_WORKERS)
+
+    if STREAMING:
+        rows = generator.build_streaming(StreamingDatasetWriter(OUTPUT_PATH), n_synthetic_versions=N_SYNTHETIC_VERSIONS)
+        print(f"Wrote {rows} rows to {OUTPUT_PATH}")
+    else:
+        final_dataset = generator.build(n_synthetic_versions=N_SYNTHETIC_VERSIONS)
+        if DEDUPLICATE:
+            final_dataset, report = NearDuplicateRemover().remove(final_dataset)
+            print("Deduplication:", report)
+        final_dataset.to_csv(OUTPUT_PATH, index=False, quoting=csv.QUOTE_ALL)
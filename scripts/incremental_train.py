@@ -0,0 +1,74 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+sys.path.append(os.path.abspath("website"))
+
+from app import create_app
+from app.models.medical_record import MedicalRecord
+from app.controllers.patient_controller import categorize_blood_pressure, categorize_cholesterol
+from diagnosis_engine.models.context_diagnosis_classifier import ContextDiagnosisClassifier
+from diagnosis_engine.incremental_fine_tuner import IncrementalFineTuner
+from synthetic_data.dataset_builder import DatasetBuilder
+
+GENDERS = {"M": "Male", "F": "Female"}
+
+def blood_pressure_category(level):
+    """
+    blood_pressure_lvl is an Integer column holding the systolic value; older rows
+    saved from the form may still hold the raw "120/80" text.
+    """
+    if isinstance(level, str) and "/" in level:
+        return categorize_blood_pressure(level)
+    try:
+        systolic = int(level)
+    except (TypeError, ValueError):
+        return "unknown"
+    if systolic < 90:
+        return "low"
+    return "normal" if systolic <= 120 else "high"
+
+def record_to_profile(record, today):
+    user = record.patient.user
+    age = today.year - user.birth_date.year - ((today.month, today.day) < (user.birth_date.month, user.birth_date.day))
+    bp = blood_pressure_category(record.blood_pressure_lvl) if record.blood_pressure_lvl else "unknown"
+    chol = categorize_cholesterol(record.cholesterol_lvl) if record.cholesterol_lvl else "unknown"
+    return {
+        "record_id": record.record_id,
+        "Disease": record.diagnosis.strip(),
+        "Symptoms": record.symptoms,
+        "Age": age,
+        "Gender": GENDERS.get(user.gender, user.gender),
+        "Blood Pressure": bp,
+        "Cholesterol Level": chol,
+    }
+
+CHECKPOINT_PATH = "diagnosis_engine/trained_models/context"
+
+fine_tuner = IncrementalFineTuner(ContextDiagnosisClassifier(model_name=CHECKPOINT_PATH), checkpoint_path=CHECKPOINT_PATH)
+last_record_id = fine_tuner.load_state()["last_record_id"]
+
+app = create_app()
+with app.app_context():
+    records = MedicalRecord.query.filter(
+        MedicalRecord.is_generated == False,
+        MedicalRecord.record_id > last_record_id,
+        MedicalRecord.diagnosis.isnot(None),
+        MedicalRecord.symptoms.isnot(None),
+    ).order_by(MedicalRecord.record_id).all()
+
+    today = date.today()
+    profiles = pd.DataFrame([record_to_profile(r, today) for r in records])
+
+if profiles.empty:
+    print(f"No new doctor-confirmed records since record {last_record_id}.")
+    sys.exit(0)
+
+records_df = DatasetBuilder.build_input_text(profiles)
+records_df["record_id"] = profiles["record_id"]
+
+print(f"Fine-tuning on {len(records_df)} new records.")
+metrics = fine_tuner.run(records_df)
+print("Evaluation:", metrics)
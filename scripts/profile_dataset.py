@@ -0,0 +1,18 @@
+from synthetic_data.dataset_profiler import DatasetProfiler
+
+DATASET_PATH = "data/synthetic/final_training_dataset.csv"
+REPORT_DIR = "data/reports"
+
+if __name__ == "__main__":
+    profiler = DatasetProfiler(tokenizer_name="t5-small", max_input_length=256, max_target_length=32)
+    report = profiler.profile(DATASET_PATH)
+
+    profiler.write_json(report, f"{REPORT_DIR}/dataset_profile.json")
+    profiler.write_html(report, f"{REPORT_DIR}/dataset_profile.html")
+
+    print(f"{report['rows']} rows, {report['labels']['distinct']} labels")
+    for name in ("input_tokens", "target_tokens"):
+        s = report[name]
+        print(f"{name}: p50={s['p50']} p99={s['p99']} max={s['max']} / {s['max_length']}, "
+              f"truncation={s['truncation_rate']:.2%}, padding={s['padding_rate']:.2%}, "
+              f"suggested max_length={s['suggested_max_length']}")
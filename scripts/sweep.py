@@ -0,0 +1,16 @@
+from diagnosis_engine.hyperparameter_sweep import HyperparameterSweep
+
+SEARCH_SPACE = {
+    "learning_rate": [2e-5, 5e-5, 1e-4],
+    "batch_size": [16, 32],
+    "max_input_length": [128, 256],
+    "max_target_length": [16, 32],
+    "num_train_epochs": [3, 5],
+}
+
+if __name__ == "__main__":
+    sweep = HyperparameterSweep(SEARCH_SPACE, n_workers=4, n_trials=12)
+    results = sweep.run()
+
+    for row in results[:5]:
+        print(row)
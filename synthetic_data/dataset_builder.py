@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 class DatasetBuilder:
@@ -6,6 +7,19 @@ class DatasetBuilder:
     suitable for model training. Generates uniform input_text.
     """
 
+    PROFILE_COLUMNS = ["Disease", "Symptoms", "Age", "Gender", "Blood Pressure", "Cholesterol Level"]
+
+    BP_PHRASES = {
+        "high": " The patient has high blood pressure.",
+        "low": " The patient has low blood pressure.",
+        "normal": " The patient has normal blood pressure."
+    }
+    CHOL_PHRASES = {
+        "high": " The patient has high cholesterol.",
+        "low": " The patient has low cholesterol.",
+        "normal": " The patient has normal cholesterol."
+    }
+
     def __init__(self, mapper, factory):
         """
         :param mapper: instance of ProfileMapper
@@ -15,39 +29,55 @@ class DatasetBuilder:
         self.factory = factory
 
     @staticmethod
-    def build_input_text(df):
-        """Builds uniform input_text for each row using patient profile + symptoms."""
-        def make_text(row):
-            ctx = f"The patient is a {row['Age']}-year-old {row['Gender'].lower()}."
-            bp = str(row.get("Blood Pressure", "")).lower()
-            if "high" in bp:
-                ctx += " The patient has high blood pressure."
-            elif "low" in bp:
-                ctx += " The patient has low blood pressure."
-            else:
-                ctx += f" The patient has normal blood pressure."
-
-            chol = str(row.get("Cholesterol Level", "")).lower()
-            if "high" in chol:
-                ctx += " The patient has high cholesterol."
-            elif "low" in chol:
-                ctx += " The patient has low cholesterol."
-            else:
-                ctx += " The patient has normal cholesterol."
-
-            symp = row.get("Symptoms", "").strip().lower()
-            return ctx + " Reported symptoms include " + symp + "."
+    def map_unique(values, fn):
+        """Applies fn to the distinct values only and broadcasts the results back through factorized codes."""
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        mapped = np.asarray([fn(value) for value in uniques], dtype=object)
+        return pd.Series(mapped[codes], index=values.index)
 
+    @staticmethod
+    def level_phrase(value, phrases):
+        """'high' wins over 'low', anything else is normal."""
+        level = str(value).lower()
+        if "high" in level:
+            return phrases["high"]
+        if "low" in level:
+            return phrases["low"]
+        return phrases["normal"]
+
+    @staticmethod
+    def build_input_text(df):
+        """
+        Builds uniform input_text for each row using patient profile + symptoms.
+        Text is only assembled for distinct (profile, symptoms) combinations, column-wise,
+        and broadcast back to the rows, so duplicated profiles share one string.
+        """
         df = df.copy()
-        df["input_text"] = df.apply(make_text, axis=1)
+        empty = pd.Series("", index=df.index, dtype=object)
+        keys = pd.DataFrame({
+            "Age": df["Age"],
+            "Gender": df["Gender"],
+            "Blood Pressure": df["Blood Pressure"] if "Blood Pressure" in df.columns else empty,
+            "Cholesterol Level": df["Cholesterol Level"] if "Cholesterol Level" in df.columns else empty,
+            "Symptoms": df["Symptoms"],
+        })
+        codes = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+        uniques = keys.drop_duplicates().reset_index(drop=True)
+        map_unique = DatasetBuilder.map_unique
+
+        texts = (
+            "The patient is a " + map_unique(uniques["Age"], str)
+            + "-year-old " + map_unique(uniques["Gender"], str.lower) + "."
+            + map_unique(uniques["Blood Pressure"], lambda v: DatasetBuilder.level_phrase(v, DatasetBuilder.BP_PHRASES))
+            + map_unique(uniques["Cholesterol Level"], lambda v: DatasetBuilder.level_phrase(v, DatasetBuilder.CHOL_PHRASES))
+            + " Reported symptoms include " + map_unique(uniques["Symptoms"], lambda v: v.strip().lower()) + "."
+        )
+        df["input_text"] = texts.to_numpy(dtype=object)[codes]
         df["target"] = df["Disease"]
         return df[["input_text", "target"]]
 
-    def build(self, n_synthetic_versions=5):
-        """
-        Combines mapped Kaggle profiles and synthetic profiles into a final dataset.
-        :param n_synthetic_versions: Number of synthetic profiles per disease
-        """
+    def mapped_profiles(self):
+        """Kaggle profiles aligned to the symptom dataset, in the profile column layout."""
         mapped_df = self.mapper.map_profiles()
 
         if "Disease" in mapped_df.columns:
@@ -55,26 +85,39 @@ class DatasetBuilder:
 
         mapped_df = mapped_df.rename(columns={"matched_disease": "Disease"})
 
-        mapped_df = mapped_df[["Disease", "Symptoms", "Age", "Gender", "Blood Pressure", "Cholesterol Level"]]
+        return mapped_df[self.PROFILE_COLUMNS]
+
+    def build(self, n_synthetic_versions=5, bulk=False, rng=None):
+        """
+        Combines mapped Kaggle profiles and synthetic profiles into a final dataset.
+        :param n_synthetic_versions: Number of synthetic profiles per disease
+        :param bulk: draw all synthetic profiles at once with a numpy Generator
+        :param rng: numpy.random.Generator used in bulk mode
+        """
+        mapped_df = self.mapped_profiles()
 
-        synthetic_list = []
-        for _, row in self.mapper.symptom_df.iterrows():
-            disease_name = row["Name"]
-            symptoms = row.get("Symptoms", "")
+        self.factory.n_versions = n_synthetic_versions
+        if bulk:
+            symptom_df = self.mapper.symptom_df
+            synthetic_df = self.factory.generate_bulk_profiles(
+                symptom_df["Name"], symptom_df["Symptoms"] if "Symptoms" in symptom_df.columns else [""] * len(symptom_df), rng
+            )
+            synthetic_df = synthetic_df[self.PROFILE_COLUMNS]
+        else:
+            synthetic_list = []
+            for _, row in self.mapper.symptom_df.iterrows():
+                disease_name = row["Name"]
+                symptoms = row.get("Symptoms", "")
 
-            self.factory.n_versions = n_synthetic_versions
-            synthetic_df = self.factory.generate_multiple_profiles(disease_name, symptoms)
+                synthetic_df = self.factory.generate_multiple_profiles(disease_name, symptoms)
 
-            synthetic_df = synthetic_df[["Disease", "Symptoms", "Age", "Gender", "Blood Pressure", "Cholesterol Level"]]
-            synthetic_list.append(synthetic_df)
+                synthetic_df = synthetic_df[self.PROFILE_COLUMNS]
+                synthetic_list.append(synthetic_df)
 
-        synthetic_df = pd.concat(synthetic_list, ignore_index=True)
+            synthetic_df = pd.concat(synthetic_list, ignore_index=True)
 
         final_df = pd.concat([mapped_df, synthetic_df], ignore_index=True)
 
         final_df = final_df.sample(frac=1, random_state=42).reset_index(drop=True)
 
         return self.build_input_text(final_df)
-
-
-
@@ -0,0 +1,221 @@
+from collections import Counter
+from transformers import AutoTokenizer
+import html
+import json
+import os
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+class DatasetProfiler:
+    """
+    Profiles a training dataset (input_text, target) in a single streaming pass:
+    label distribution, token-length histograms, truncation and padding rates against the
+    classifier's max lengths, and gender / blood pressure / cholesterol balance per disease.
+    Profile attributes are recovered from the uniform input_text built by DatasetBuilder.
+    Only running counters are kept in memory, never the dataset itself.
+    """
+
+    ATTRIBUTE_PATTERNS = {
+        "gender": r"-year-old (\w+)\.",
+        "blood_pressure": r"has (high|low|normal) blood pressure",
+        "cholesterol": r"has (high|low|normal) cholesterol",
+    }
+    PERCENTILES = [50, 90, 95, 99]
+
+    def __init__(self, tokenizer_name="t5-small", max_input_length=256, max_target_length=32,
+                 chunk_size=10000, batch_size=1000):
+        """
+        :param tokenizer_name: tokenizer of the model that will be trained (a fast tokenizer is required)
+        :param max_input_length: input truncation limit used by preprocess_data
+        :param max_target_length: target truncation limit used by preprocess_data
+        :param chunk_size: rows read from disk at a time
+        :param batch_size: texts per tokenizer call
+        """
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, use_fast=True)
+        if not self.tokenizer.is_fast:
+            raise ValueError(f"{tokenizer_name} has no fast tokenizer")
+        self.max_input_length = max_input_length
+        self.max_target_length = max_target_length
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def iter_chunks(self, path):
+        if path.endswith(".parquet"):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_size, columns=["input_text", "target"]):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, usecols=["input_text", "target"], chunksize=self.chunk_size)
+
+    def token_lengths(self, texts):
+        """Untruncated token counts (special tokens included), tokenized in batches."""
+        lengths = []
+        for i in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + self.batch_size], return_length=True,
+                return_attention_mask=False, return_token_type_ids=False
+            )
+            lengths.extend(encoded["length"])
+        return np.asarray(lengths, dtype=np.int64)
+
+    @staticmethod
+    def add_counts(histogram, lengths):
+        counts = np.bincount(lengths)
+        if len(counts) > len(histogram):
+            histogram = np.pad(histogram, (0, len(counts) - len(histogram)))
+        histogram[:len(counts)] += counts
+        return histogram
+
+    def profile(self, path):
+        """
+        :param path: CSV or Parquet file with input_text and target columns
+        :return: report dict
+        """
+        rows = 0
+        labels = Counter()
+        input_hist = np.zeros(0, dtype=np.int64)
+        target_hist = np.zeros(0, dtype=np.int64)
+        attributes = {name: Counter() for name in self.ATTRIBUTE_PATTERNS}
+
+        for chunk in self.iter_chunks(path):
+            inputs = chunk["input_text"].astype(str)
+            targets = chunk["target"].astype(str)
+            rows += len(chunk)
+            labels.update(targets.value_counts().to_dict())
+
+            input_hist = self.add_counts(input_hist, self.token_lengths(inputs.tolist()))
+            target_hist = self.add_counts(target_hist, self.token_lengths(targets.tolist()))
+
+            for name, pattern in self.ATTRIBUTE_PATTERNS.items():
+                values = inputs.str.extract(pattern, expand=False).str.lower().fillna("unknown")
+                attributes[name].update(pd.DataFrame({"target": targets, "value": values}).value_counts().to_dict())
+
+        return {
+            "dataset": path,
+            "rows": rows,
+            "labels": self.label_summary(labels),
+            "input_tokens": self.length_summary(input_hist, self.max_input_length),
+            "target_tokens": self.length_summary(target_hist, self.max_target_length),
+            "balance": {name: self.balance_summary(counts) for name, counts in attributes.items()},
+        }
+
+    @staticmethod
+    def label_summary(labels):
+        counts = np.asarray(list(labels.values()))
+        return {
+            "distinct": len(labels),
+            "min_per_label": int(counts.min()) if len(counts) else 0,
+            "max_per_label": int(counts.max()) if len(counts) else 0,
+            "mean_per_label": round(float(counts.mean()), 2) if len(counts) else 0,
+            "counts": dict(labels.most_common()),
+        }
+
+    def length_summary(self, histogram, max_length, bin_width=8):
+        """Percentiles, truncation and padding rates from an exact length histogram."""
+        total = int(histogram.sum())
+        if total == 0:
+            return {"max_length": max_length, "count": 0}
+        lengths = np.arange(len(histogram))
+        cumulative = np.cumsum(histogram)
+        percentiles = {
+            f"p{p}": int(np.searchsorted(cumulative, total * p / 100)) for p in self.PERCENTILES
+        }
+        kept = np.minimum(lengths, max_length)
+        # preprocess_data pads every sequence to max_length, so padding is the unused share of each row
+        padding_rate = 1 - float((histogram * kept).sum()) / (total * max_length)
+
+        bins = np.add.reduceat(histogram, np.arange(0, len(histogram), bin_width))
+        return {
+            "max_length": max_length,
+            "count": total,
+            "mean": round(float((histogram * lengths).sum()) / total, 2),
+            "max": int(lengths[histogram > 0].max()),
+            **percentiles,
+            "truncated": int(histogram[max_length + 1:].sum()),
+            "truncation_rate": round(float(histogram[max_length + 1:].sum()) / total, 4),
+            "padding_rate": round(padding_rate, 4),
+            "suggested_max_length": int(-(-percentiles["p99"] // 8) * 8),
+            "histogram": {"bin_width": bin_width, "counts": [int(c) for c in bins]},
+        }
+
+    @staticmethod
+    def balance_summary(counts):
+        """
+        Per-disease value counts for one attribute, with the share of the most common value
+        and the normalized entropy (1.0 = perfectly balanced, 0.0 = a single value).
+        """
+        table = pd.Series(counts, dtype=np.int64)
+        if table.empty:
+            return {"overall": {}, "per_disease": {}}
+        table = table.unstack(fill_value=0)
+
+        shares = table.div(table.sum(axis=1), axis=0)
+        n_values = (table > 0).sum(axis=1)
+        entropy = (shares * np.log(shares.where(shares > 0, 1))).sum(axis=1).abs()
+        normalized = entropy / np.log(table.shape[1]) if table.shape[1] > 1 else entropy * 0
+
+        per_disease = {
+            disease: {
+                "counts": {k: int(v) for k, v in table.loc[disease].items() if v},
+                "dominant_share": round(float(shares.loc[disease].max()), 3),
+                "entropy": round(float(normalized.loc[disease]), 3),
+                "values_seen": int(n_values.loc[disease]),
+            }
+            for disease in normalized.sort_values().index
+        }
+        return {
+            "overall": {k: int(v) for k, v in table.sum().items()},
+            "per_disease": per_disease,
+        }
+
+    @staticmethod
+    def write_json(report, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def write_html(report, path, top_n=20):
+        """Compact HTML view: length stats with histograms, label extremes and the least balanced diseases."""
+        def table(headers, rows):
+            head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+            body = "".join("<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in row) + "</tr>" for row in rows)
+            return f"<table><tr>{head}</tr>{body}</table>"
+
+        def histogram(summary):
+            counts = summary.get("histogram", {}).get("counts", [])
+            width = summary.get("histogram", {}).get("bin_width", 1)
+            peak = max(counts) if counts else 1
+            rows = [
+                (f"{i * width}-{(i + 1) * width - 1}", c, "#" * max(int(40 * c / peak), 1 if c else 0))
+                for i, c in enumerate(counts)
+            ]
+            return table(["tokens", "rows", ""], rows)
+
+        sections = [f"<h1>Dataset profile</h1><p>{html.escape(report['dataset'])}: {report['rows']} rows</p>"]
+        for name in ("input_tokens", "target_tokens"):
+            summary = report[name]
+            stats = [(k, v) for k, v in summary.items() if k != "histogram"]
+            sections.append(f"<h2>{name}</h2>" + table(["stat", "value"], stats) + histogram(summary))
+
+        labels = report["labels"]
+        ordered = list(labels["counts"].items())
+        sections.append(
+            f"<h2>labels</h2><p>{labels['distinct']} distinct, {labels['min_per_label']}-{labels['max_per_label']} rows per label</p>"
+            + table(["most frequent", "rows"], ordered[:top_n])
+            + table(["least frequent", "rows"], ordered[-top_n:][::-1])
+        )
+
+        for name, balance in report["balance"].items():
+            rows = [
+                (disease, s["entropy"], s["dominant_share"], ", ".join(f"{k}={v}" for k, v in s["counts"].items()))
+                for disease, s in list(balance["per_disease"].items())[:top_n]
+            ]
+            overall = ", ".join(f"{k}={v}" for k, v in balance["overall"].items())
+            sections.append(f"<h2>{name} balance</h2><p>overall: {html.escape(overall)}</p>"
+                            + table(["least balanced disease", "entropy", "dominant share", "counts"], rows))
+
+        style = "<style>body{font-family:sans-serif}table{border-collapse:collapse;margin:8px 0}td,th{border:1px solid #ccc;padding:2px 6px;text-align:left}</style>"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<html><head><meta charset='utf-8'>{style}</head><body>{''.join(sections)}</body></html>")
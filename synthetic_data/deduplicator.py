@@ -0,0 +1,106 @@
+import zlib
+import numpy as np
+import pandas as pd
+
+class NearDuplicateRemover:
+    """
+    Removes redundant training rows in three stages:
+    1. exact duplicates of (input_text, target), found by row hash,
+    2. near duplicates with the same target, found with MinHash signatures over word
+       shingles and LSH banding, confirmed by the estimated Jaccard similarity,
+    3. an optional cap on the number of rows kept per target.
+    The first occurrence of every group is kept, so the result follows the input order.
+    """
+
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+    def __init__(self, shingle_size=3, num_perm=64, bands=16, jaccard_threshold=0.85,
+                 max_per_target=None, seed=42):
+        """
+        :param num_perm: MinHash signature length, must be divisible by bands
+        :param jaccard_threshold: estimated similarity above which two rows are near duplicates
+        :param max_per_target: keep at most this many rows per target (no cap when None)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.jaccard_threshold = jaccard_threshold
+        self.max_per_target = max_per_target
+
+        rng = np.random.default_rng(seed)
+        # a, b < 2**32 and shingle hashes < 2**32 keep a * x + b inside uint64
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, text):
+        tokens = str(text).lower().split()
+        k = min(self.shingle_size, len(tokens)) or 1
+        shingles = {" ".join(tokens[i:i + k]) for i in range(max(len(tokens) - k + 1, 1))}
+        return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    def signatures(self, texts):
+        """MinHash signature matrix of shape (len(texts), num_perm)."""
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for i, text in enumerate(texts):
+            hashes = self.shingle_hashes(text)
+            sigs[i] = ((hashes[:, None] * self.a + self.b) % self.MERSENNE_PRIME).min(axis=0)
+        return sigs
+
+    def near_duplicate_mask(self, df):
+        """True for rows that are near duplicates of an earlier row with the same target."""
+        n = len(df)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+
+        sigs = self.signatures(df["input_text"].tolist())
+        target_codes = pd.factorize(df["target"])[0]
+        rows_per_band = self.num_perm // self.bands
+        positions = np.arange(n)
+        representative = np.full(n, -1)
+
+        for band in range(self.bands):
+            band_sig = sigs[:, band * rows_per_band:(band + 1) * rows_per_band]
+            keys = pd.DataFrame(band_sig.view(np.int64)).assign(target=target_codes)
+            band_hash = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+            first = pd.Series(positions).groupby(band_hash).transform("first").to_numpy()
+            candidates = (first != positions) & (representative < 0)
+            representative[candidates] = first[candidates]
+
+        mask = np.zeros(n, dtype=bool)
+        candidates = np.flatnonzero(representative >= 0)
+        if len(candidates):
+            similarity = (sigs[candidates] == sigs[representative[candidates]]).mean(axis=1)
+            mask[candidates] = similarity >= self.jaccard_threshold
+        return mask
+
+    def remove(self, df):
+        """
+        :param df: DataFrame with input_text and target columns
+        :return: (deduplicated DataFrame, report dict)
+        """
+        rows_in = len(df)
+
+        exact = pd.util.hash_pandas_object(df[["input_text", "target"]], index=False).duplicated().to_numpy()
+        df = df[~exact]
+
+        near = self.near_duplicate_mask(df)
+        df = df[~near]
+
+        capped = 0
+        if self.max_per_target is not None:
+            keep = df.groupby("target", sort=False).cumcount().to_numpy() < self.max_per_target
+            capped = int((~keep).sum())
+            df = df[keep]
+
+        df = df.reset_index(drop=True)
+        report = {
+            "rows_in": rows_in,
+            "exact_duplicates": int(exact.sum()),
+            "near_duplicates": int(near.sum()),
+            "capped": capped,
+            "rows_out": len(df),
+            "compression_ratio": round(rows_in / len(df), 3) if len(df) else None,
+        }
+        return df, report
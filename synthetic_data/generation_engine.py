@@ -0,0 +1,103 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from synthetic_data.dataset_builder import DatasetBuilder
+from synthetic_data.patient_profile_factory import PatientProfileFactory
+
+class ParallelDatasetGenerator:
+    """
+    Generates the synthetic training set with diseases sharded across a process pool.
+    Shards are fixed-size slices of the symptom dataset and each one draws from its own
+    Generator spawned from a single master SeedSequence, so for a given seed and shard_size
+    the output is identical no matter how many workers run.
+    """
+
+    def __init__(self, builder, seed=42, n_workers=1, shard_size=64):
+        """
+        :param builder: instance of DatasetBuilder (provides the mapper, factory and text builder)
+        :param seed: master seed for every random draw of the run
+        :param shard_size: diseases per shard; part of the reproducibility contract together with seed
+        """
+        self.builder = builder
+        self.seed = seed
+        self.n_workers = n_workers
+        self.shard_size = shard_size
+
+    def shards(self):
+        symptom_df = self.builder.mapper.symptom_df
+        names = symptom_df["Name"].tolist()
+        symptoms = symptom_df["Symptoms"].tolist() if "Symptoms" in symptom_df.columns else [""] * len(names)
+        return [
+            (names[i:i + self.shard_size], symptoms[i:i + self.shard_size])
+            for i in range(0, len(names), self.shard_size)
+        ]
+
+    def seed_sequences(self, n_shards):
+        """One child sequence per shard plus a final one reserved for the shuffle."""
+        return np.random.SeedSequence(self.seed).spawn(n_shards + 1)
+
+    def generate_synthetic(self, n_synthetic_versions=5):
+        frames = list(self.iter_synthetic(n_synthetic_versions))
+        if not frames:
+            return pd.DataFrame(columns=self.builder.PROFILE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def iter_synthetic(self, n_synthetic_versions=5):
+        """
+        Yields shard frames in shard order while keeping at most 2 * n_workers shards in flight,
+        so memory stays bounded by the window rather than the whole dataset.
+        """
+        shards = self.shards()
+        seeds = self.seed_sequences(len(shards))[:-1]
+        tasks = [(names, symptoms, n_synthetic_versions, seq) for (names, symptoms), seq in zip(shards, seeds)]
+
+        if self.n_workers <= 1:
+            for task in tasks:
+                yield _generate_shard(*task)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_generate_shard, *task))
+                if len(pending) >= 2 * self.n_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def build_streaming(self, writer, n_synthetic_versions=5):
+        """
+        Streams mapped and synthetic chunks through build_input_text into a StreamingDatasetWriter.
+        The writer's shuffle is seeded from the master seed unless it was given its own rng.
+        :return: number of rows written
+        """
+        if writer.rng is None:
+            writer.rng = np.random.default_rng(self.seed_sequences(len(self.shards()))[-1])
+
+        def chunks():
+            yield self.builder.build_input_text(self.builder.mapped_profiles())
+            for frame in self.iter_synthetic(n_synthetic_versions):
+                yield self.builder.build_input_text(frame)
+
+        return writer.write(chunks())
+
+    def shuffle(self, df):
+        shuffle_seq = self.seed_sequences(len(self.shards()))[-1]
+        order = np.random.default_rng(shuffle_seq).permutation(len(df))
+        return df.iloc[order].reset_index(drop=True)
+
+    def build(self, n_synthetic_versions=5):
+        """Mapped Kaggle profiles + sharded synthetic profiles, shuffled with the master seed."""
+        mapped_df = self.builder.mapped_profiles()
+        synthetic_df = self.generate_synthetic(n_synthetic_versions)
+
+        final_df = pd.concat([mapped_df, synthetic_df], ignore_index=True)
+        return self.builder.build_input_text(self.shuffle(final_df))
+
+
+def _generate_shard(names, symptoms, n_versions, seed_sequence):
+    factory = PatientProfileFactory(n_versions=n_versions)
+    profiles = factory.generate_bulk_profiles(names, symptoms, rng=np.random.default_rng(seed_sequence))
+    return profiles[DatasetBuilder.PROFILE_COLUMNS]
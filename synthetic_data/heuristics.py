@@ -1,47 +1,109 @@
 import random
 import json
-from synthetic_data.utils import contains_any_keyword
+from functools import lru_cache
+import numpy as np
+from common.keyword_matcher import KeywordMatcher
 
 with open("synthetic_data/heuristics_config.json") as f:
     CONFIG = json.load(f)
 
-def assign_gender(disease_name, symptoms=None):
-    text = str(disease_name) + " " + str(symptoms or "")
-    g_conf = CONFIG["gender"]
-    if contains_any_keyword(text, g_conf["female"] + g_conf["mature_female"]):
+MATCHER = KeywordMatcher({
+    "female": CONFIG["gender"]["female"],
+    "mature_female": CONFIG["gender"]["mature_female"],
+    "male": CONFIG["gender"]["male"],
+    "mature_male": CONFIG["gender"]["mature_male"],
+    "elderly": CONFIG.get("elderly", []),
+    "bp_high": CONFIG["blood_pressure"]["high"],
+    "bp_low": CONFIG["blood_pressure"]["low"],
+    "chol_high": CONFIG["cholesterol"]["high"],
+})
+
+@lru_cache(maxsize=65536)
+def _classify_text(disease_name, symptoms):
+    return MATCHER.flags(disease_name + " " + symptoms)
+
+def classify_keywords(disease_name, symptoms=None):
+    """
+    Returns the keyword flags used by the assign_* heuristics for one disease.
+    All categories come from a single scan of the text and are memoized per (disease, symptoms) pair.
+    """
+    return dict(_classify_text(str(disease_name), str(symptoms or "")))
+
+def assign_gender(disease_name, symptoms=None, rng=None):
+    rng = rng or random
+    flags = classify_keywords(disease_name, symptoms)
+    if flags["female"] or flags["mature_female"]:
         return "Female"
-    if contains_any_keyword(text, g_conf["male"] + g_conf["mature_male"]):
+    if flags["male"] or flags["mature_male"]:
         return "Male"
-    return random.choice(["Male", "Female"])
+    return rng.choice(["Male", "Female"])
 
-def assign_age(disease_name, symptoms=None):
-    text = str(disease_name) + " " + str(symptoms or "")
+def assign_age(disease_name, symptoms=None, rng=None):
+    rng = rng or random
+    flags = classify_keywords(disease_name, symptoms)
     a_conf = CONFIG["age"]
 
-    if contains_any_keyword(text, CONFIG["gender"]["female"]):
-        return random.randint(*a_conf["female"])
-    if contains_any_keyword(text, CONFIG["gender"]["mature_female"]):
-        return random.randint(*a_conf["mature_female"])
-    if contains_any_keyword(text, CONFIG["gender"]["male"]):
-        return random.randint(*a_conf["male"])
-    if contains_any_keyword(text, CONFIG["gender"]["mature_male"]):
-        return random.randint(*a_conf["mature_male"])
-    if contains_any_keyword(text, CONFIG.get("elderly", [])):
-        return random.randint(*a_conf.get("elderly", [60, 90]))
-    return random.randint(*a_conf["default"])
-
-def assign_blood_pressure(disease_name, symptoms=None):
-    text = str(disease_name) + " " + str(symptoms or "")
-    bp_conf = CONFIG["blood_pressure"]
-    if contains_any_keyword(text, bp_conf["high"]):
+    if flags["female"]:
+        return rng.randint(*a_conf["female"])
+    if flags["mature_female"]:
+        return rng.randint(*a_conf["mature_female"])
+    if flags["male"]:
+        return rng.randint(*a_conf["male"])
+    if flags["mature_male"]:
+        return rng.randint(*a_conf["mature_male"])
+    if flags["elderly"]:
+        return rng.randint(*a_conf.get("elderly", [60, 90]))
+    return rng.randint(*a_conf["default"])
+
+def assign_blood_pressure(disease_name, symptoms=None, rng=None):
+    rng = rng or random
+    flags = classify_keywords(disease_name, symptoms)
+    if flags["bp_high"]:
         return "High"
-    if contains_any_keyword(text, bp_conf["low"]):
+    if flags["bp_low"]:
         return "Low"
-    return random.choices(["Normal", "High", "Low"], weights=[0.7, 0.2, 0.1], k=1)[0]
+    return rng.choices(["Normal", "High", "Low"], weights=[0.7, 0.2, 0.1], k=1)[0]
 
-def assign_cholesterol(disease_name, symptoms=None):
-    text = str(disease_name) + " " + str(symptoms or "")
-    chol_conf = CONFIG["cholesterol"]
-    if contains_any_keyword(text, chol_conf["high"]):
+def assign_cholesterol(disease_name, symptoms=None, rng=None):
+    rng = rng or random
+    flags = classify_keywords(disease_name, symptoms)
+    if flags["chol_high"]:
         return "High"
-    return random.choices(["Normal", "High"], weights=[0.8, 0.2], k=1)[0]
+    return rng.choices(["Normal", "High"], weights=[0.8, 0.2], k=1)[0]
+
+def assign_profiles_bulk(flags, n_versions, rng=None):
+    """
+    Vectorized counterpart of assign_gender/age/blood_pressure/cholesterol.
+    :param flags: DataFrame of classify_keywords() results, one row per disease
+    :param n_versions: number of profiles drawn per disease
+    :param rng: numpy.random.Generator
+    :return: dict of arrays, disease-major (all versions of disease 0 first)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    f = {k: np.repeat(flags[k].to_numpy(dtype=bool), n_versions) for k in flags.columns}
+    n = len(f["female"])
+    a_conf = CONFIG["age"]
+
+    any_female = f["female"] | f["mature_female"]
+    any_male = f["male"] | f["mature_male"]
+    random_gender = np.where(rng.random(n) < 0.5, "Male", "Female")
+    gender = np.where(any_female, "Female", np.where(any_male, "Male", random_gender))
+
+    age_conditions = [f["female"], f["mature_female"], f["male"], f["mature_male"], f["elderly"]]
+    age_ranges = [a_conf["female"], a_conf["mature_female"], a_conf["male"], a_conf["mature_male"], a_conf.get("elderly", [60, 90])]
+    low = np.select(age_conditions, [r[0] for r in age_ranges], default=a_conf["default"][0])
+    high = np.select(age_conditions, [r[1] for r in age_ranges], default=a_conf["default"][1])
+    age = rng.integers(low, high + 1)
+
+    random_bp = rng.choice(np.array(["Normal", "High", "Low"]), size=n, p=[0.7, 0.2, 0.1])
+    blood_pressure = np.where(f["bp_high"], "High", np.where(f["bp_low"], "Low", random_bp))
+
+    random_chol = rng.choice(np.array(["Normal", "High"]), size=n, p=[0.8, 0.2])
+    cholesterol = np.where(f["chol_high"], "High", random_chol)
+
+    return {
+        "Gender": gender,
+        "Age": age,
+        "Blood Pressure": blood_pressure,
+        "Cholesterol Level": cholesterol,
+    }
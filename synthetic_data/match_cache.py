@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+
+class MatchCache:
+    """
+    On-disk cache of fuzzy disease alignments (disease_norm -> matched_norm, score).
+    Entries are keyed by the hash of the candidate name list, the scorer and the threshold;
+    each entry also remembers the hash of the last query list, so an unchanged build reuses
+    the table as is and a changed one only has to score the names it has never seen.
+    """
+
+    def __init__(self, path="data/cache/profile_mapper_matches.json"):
+        self.path = path
+        self.entries = None
+
+    @staticmethod
+    def hash_names(names):
+        payload = json.dumps(sorted(set(names)), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def entry_key(choices, scorer_name, threshold):
+        return f"{MatchCache.hash_names(choices)}:{scorer_name}:{threshold}"
+
+    def load(self):
+        if self.entries is None:
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            else:
+                self.entries = {}
+        return self.entries
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries or {}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, queries, choices, scorer_name, threshold):
+        """
+        :return: (table, missing) where table maps cached query -> [matched_norm or None, score]
+                 and missing lists the queries that still need scoring
+        """
+        entry = self.load().get(self.entry_key(choices, scorer_name, threshold))
+        if entry is None:
+            return {}, list(queries)
+        table = entry["matches"]
+        if entry.get("queries_hash") == self.hash_names(queries):
+            return table, []
+        return table, [q for q in queries if q not in table]
+
+    def store(self, queries, choices, scorer_name, threshold, new_matches):
+        """Merges newly scored queries into the entry and persists the file."""
+        entries = self.load()
+        key = self.entry_key(choices, scorer_name, threshold)
+        entry = entries.setdefault(key, {"matches": {}})
+        entry["matches"].update(new_matches)
+        entry["queries_hash"] = self.hash_names(queries)
+        self.save()
+        return entry["matches"]
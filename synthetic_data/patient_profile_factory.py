@@ -1,4 +1,5 @@
-from synthetic_data.heuristics import assign_gender, assign_age, assign_blood_pressure, assign_cholesterol
+from synthetic_data.heuristics import assign_gender, assign_age, assign_blood_pressure, assign_cholesterol, classify_keywords, assign_profiles_bulk
+import numpy as np
 import pandas as pd
 
 class PatientProfileFactory:
@@ -9,18 +10,37 @@ class PatientProfileFactory:
     def __init__(self, n_versions=5):
         self.n_versions = n_versions
 
-    def generate_profile(self, disease_name, symptoms=None):
+    def generate_profile(self, disease_name, symptoms=None, rng=None):
+        """:param rng: random.Random instance, the global random module when None"""
         return {
             "Disease": disease_name,
             "Symptoms": symptoms,
-            "Gender": assign_gender(disease_name, symptoms),
-            "Age": assign_age(disease_name, symptoms),
-            "Blood Pressure": assign_blood_pressure(disease_name, symptoms),
-            "Cholesterol Level": assign_cholesterol(disease_name, symptoms)
+            "Gender": assign_gender(disease_name, symptoms, rng),
+            "Age": assign_age(disease_name, symptoms, rng),
+            "Blood Pressure": assign_blood_pressure(disease_name, symptoms, rng),
+            "Cholesterol Level": assign_cholesterol(disease_name, symptoms, rng)
         }
 
-    def generate_multiple_profiles(self, disease_name, symptoms=None, as_dataframe=True):
-        profiles = [self.generate_profile(disease_name, symptoms) for _ in range(self.n_versions)]
+    def generate_multiple_profiles(self, disease_name, symptoms=None, as_dataframe=True, rng=None):
+        profiles = [self.generate_profile(disease_name, symptoms, rng) for _ in range(self.n_versions)]
         if as_dataframe:
             return pd.DataFrame(profiles)
         return profiles
+
+    def generate_bulk_profiles(self, disease_names, symptoms_list, rng=None):
+        """
+        Generates n_versions profiles for every disease in a few vectorized draws.
+        Keyword flags are computed once per disease instead of once per profile.
+        :param rng: numpy.random.Generator, a fresh default_rng() when None
+        :return: single DataFrame, all versions of each disease kept together
+        """
+        disease_names = list(disease_names)
+        symptoms_list = list(symptoms_list)
+        flags = pd.DataFrame([classify_keywords(d, s) for d, s in zip(disease_names, symptoms_list)])
+        drawn = assign_profiles_bulk(flags, self.n_versions, rng)
+
+        return pd.DataFrame({
+            "Disease": np.repeat(np.asarray(disease_names, dtype=object), self.n_versions),
+            "Symptoms": np.repeat(np.asarray(symptoms_list, dtype=object), self.n_versions),
+            **drawn
+        })
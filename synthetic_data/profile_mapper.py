@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import re
 from rapidfuzz import process, fuzz
@@ -9,9 +10,13 @@ class ProfileMapper:
     using RapidFuzz distance-based matching. Does NOT create final sentences.
     """
 
-    def __init__(self, kaggle_csv_path, symptom_dataset=None, threshold=65):
+    def __init__(self, kaggle_csv_path, symptom_dataset=None, threshold=65, cache=None):
+        """
+        :param cache: optional MatchCache persisting the disease alignment between builds
+        """
         self.df_kaggle = pd.read_csv(kaggle_csv_path)
-        
+        self.cache = cache
+
         self.df_kaggle = self.df_kaggle[self.df_kaggle["Outcome Variable"].str.lower() == "positive"]
         self.threshold = threshold
 
@@ -44,6 +49,41 @@ class ProfileMapper:
                 return matched_name
         return None
 
+    def score_names(self, queries):
+        """
+        Matches distinct normalized names against sym_norm_list with one score matrix.
+        Same result as find_closest_disease per name: best fuzz.ratio, first choice on ties,
+        None below the threshold.
+        :return: dict {norm_name: [matched_norm or None, score]}
+        """
+        if not queries:
+            return {}
+        if not self.sym_norm_list:
+            return {q: [None, 0.0] for q in queries}
+
+        scores = process.cdist(queries, self.sym_norm_list, scorer=fuzz.ratio, dtype=np.float64, workers=-1)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(queries)), best]
+        choices = np.asarray(self.sym_norm_list, dtype=object)
+        matched = np.where(best_scores >= self.threshold, choices[best], None)
+        return {q: [m, float(score)] for q, m, score in zip(queries, matched.tolist(), best_scores.tolist())}
+
+    def match_table(self):
+        """
+        Alignment of every Kaggle disease_norm, {norm_name: [matched_norm or None, score]}.
+        With a MatchCache only names missing from the cache are scored.
+        """
+        queries = pd.unique(self.df_kaggle["disease_norm"].astype(object)).tolist()
+        if self.cache is None:
+            table = self.score_names(queries)
+        else:
+            scorer_name = fuzz.ratio.__name__
+            table, missing = self.cache.lookup(queries, self.sym_norm_list, scorer_name, self.threshold)
+            if missing:
+                table = self.cache.store(queries, self.sym_norm_list, scorer_name, self.threshold, self.score_names(missing))
+
+        return {q: table[q] for q in queries}
+
     def map_profiles(self):
         """
         Returns a DataFrame with:
@@ -52,7 +92,8 @@ class ProfileMapper:
         - corresponding symptom list
         Does NOT generate input_text.
         """
-        self.df_kaggle["matched_norm"] = self.df_kaggle["disease_norm"].apply(self.find_closest_disease)
+        matches = {name: matched for name, (matched, _) in self.match_table().items()}
+        self.df_kaggle["matched_norm"] = self.df_kaggle["disease_norm"].map(matches)
         self.df_kaggle["matched_disease"] = self.df_kaggle["matched_norm"].map(self.norm_to_name)
 
         matched = self.df_kaggle.dropna(subset=["matched_disease"]).copy()
@@ -62,6 +103,6 @@ class ProfileMapper:
         return merged
 
     def get_unmatched_diseases(self):
-        hf_set = set(self.symptom_df["disease_norm"])                   
-        matched_hf_set = set(self.df_kaggle["matched_norm"].dropna()) 
-        return hf_set - matched_hf_set  
+        hf_set = set(self.symptom_df["disease_norm"])
+        matched_hf_set = {matched for matched, _ in self.match_table().values() if matched is not None}
+        return hf_set - matched_hf_set
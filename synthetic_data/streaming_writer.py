@@ -0,0 +1,135 @@
+import csv
+import math
+import os
+import shutil
+import tempfile
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+class StreamingDatasetWriter:
+    """
+    Writes a dataset that arrives as a stream of DataFrame chunks to Parquet or chunked CSV,
+    shuffling it with bounded memory (shard-then-interleave):
+    1. every incoming row is scattered to one of n_buckets temporary Parquet files at random,
+    2. each bucket is then loaded on its own, permuted and appended to the output.
+    A bucket that ends up with more than rows_per_bucket rows is scattered again into
+    smaller buckets before it is loaded, so peak memory is one incoming chunk plus at most
+    rows_per_bucket rows, whatever the total size of the dataset.
+    """
+
+    def __init__(self, output_path, rows_per_bucket=200_000, n_buckets=16, max_open_buckets=256,
+                 rng=None, tmp_dir=None):
+        """
+        :param output_path: .parquet writes row groups, anything else writes CSV chunks with QUOTE_ALL
+        :param rows_per_bucket: most rows loaded into memory at once in pass 2
+        :param n_buckets: buckets of the first pass; the row count is unknown until the stream ends
+        :param max_open_buckets: most bucket files written at once when an oversized bucket is split
+        :param rng: numpy.random.Generator driving the shuffle, a fresh default_rng() when None
+        """
+        self.output_path = output_path
+        self.rows_per_bucket = max(int(rows_per_bucket), 1)
+        self.n_buckets = n_buckets
+        self.max_open_buckets = max_open_buckets
+        self.rng = rng
+        self.tmp_dir = tmp_dir
+        self.rows_written = 0
+        self.schema = None
+
+    @property
+    def is_parquet(self):
+        return self.output_path.endswith(".parquet")
+
+    def scatter(self, frames, workdir, n_buckets, prefix="bucket"):
+        """Spreads the rows of every chunk over n_buckets bucket files; returns the non-empty ones."""
+        writers = [None] * n_buckets
+        paths = [os.path.join(workdir, f"{prefix}_{i:04d}.parquet") for i in range(n_buckets)]
+        try:
+            for frame in frames:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                # chunks may disagree on string types (object vs str columns); pin the first schema
+                self.schema = self.schema or table.schema
+                if frame.empty:
+                    continue
+                table = table.cast(self.schema)
+
+                buckets = self.rng.integers(n_buckets, size=len(frame))
+                for b in np.unique(buckets):
+                    part = table.take(np.flatnonzero(buckets == b))
+                    if writers[b] is None:
+                        writers[b] = pq.ParquetWriter(paths[b], self.schema)
+                    writers[b].write_table(part)
+        finally:
+            for writer in writers:
+                if writer is not None:
+                    writer.close()
+        return [p for p, w in zip(paths, writers) if w is not None]
+
+    def split(self, path, n_rows):
+        """Scatters an oversized bucket into sub-buckets averaging half of rows_per_bucket."""
+        n_buckets = min(math.ceil(2 * n_rows / self.rows_per_bucket), self.max_open_buckets)
+        batches = pq.ParquetFile(path).iter_batches(batch_size=self.rows_per_bucket)
+        prefix = os.path.splitext(os.path.basename(path))[0]
+        sub_paths = self.scatter((batch.to_pandas() for batch in batches), os.path.dirname(path), n_buckets, prefix)
+        os.remove(path)
+        return sub_paths
+
+    def shuffled_buckets(self, bucket_paths):
+        """Yields every bucket as a permuted DataFrame, splitting the ones over rows_per_bucket first."""
+        pending = list(reversed(bucket_paths))
+        while pending:
+            path = pending.pop()
+            n_rows = pq.ParquetFile(path).metadata.num_rows
+            if n_rows > self.rows_per_bucket:
+                # keep the sub-buckets in place of their parent so the output order stays random
+                pending.extend(reversed(self.split(path, n_rows)))
+                continue
+            bucket = pq.read_table(path).to_pandas()
+            yield bucket.iloc[self.rng.permutation(len(bucket))].reset_index(drop=True)
+
+    def interleave(self, bucket_paths):
+        """Pass 2: appends the permuted buckets to the output, headers only when there are none."""
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        parquet_writer = None
+        first_chunk = True
+        try:
+            for bucket in self.shuffled_buckets(bucket_paths):
+                if self.is_parquet:
+                    table = pa.Table.from_pandas(bucket, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+                    parquet_writer.write_table(table)
+                else:
+                    bucket.to_csv(
+                        self.output_path, index=False, quoting=csv.QUOTE_ALL,
+                        mode="w" if first_chunk else "a", header=first_chunk
+                    )
+                first_chunk = False
+                self.rows_written += len(bucket)
+
+            if first_chunk:
+                schema = self.schema or pa.schema([])
+                if self.is_parquet:
+                    pq.write_table(schema.empty_table(), self.output_path)
+                else:
+                    schema.empty_table().to_pandas().to_csv(self.output_path, index=False, quoting=csv.QUOTE_ALL)
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+    def write(self, frames):
+        """
+        Consumes an iterable of DataFrames with identical columns and writes the shuffled result.
+        Empty input still writes the output, with just the header (or schema) when known.
+        :return: number of rows written
+        """
+        if self.rng is None:
+            self.rng = np.random.default_rng()
+        workdir = tempfile.mkdtemp(prefix="medsyn_shuffle_", dir=self.tmp_dir)
+        try:
+            self.rows_written = 0
+            self.schema = None
+            self.interleave(self.scatter(frames, workdir, self.n_buckets))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        return self.rows_written
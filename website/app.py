@@ -1,4 +1,5 @@
 from app import create_app
+import logging
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))  
@@ -8,4 +9,6 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 app = create_app()
 
 if __name__ == "__main__":
+    # INFO for the ocr_service loggers (cache hit rates, image payload sizes)
+    logging.basicConfig(level=logging.INFO)
     app.run(debug=True)
@@ -1,6 +1,5 @@
 from datetime import datetime, date, timedelta
 import os
-import csv
 
 from flask import Blueprint, render_template, request, redirect, url_for, session, jsonify, flash
 
@@ -15,8 +14,16 @@ from app.models.appointment import Appointment
 from app.models.notification import Notification
 from app.models.medical_record import MedicalRecord
 
+from app.services.specialization_index import SpecializationIndex
+from app.services.upload_service import checked_upload, UploadTooLarge
+
 from ocr_service.ocr_engine import OCREngine
 from ocr_service.medical_extractor import MedicalInfoExtractor
+from ocr_service.local_extractor import LocalMedicalInfoExtractor
+from ocr_service.result_cache import ResultCache
+from ocr_service.document_pipeline import DocumentPipeline
+from ocr_service.image_preprocessor import ImagePreprocessor
+from ocr_service.resilience import ResilientCaller
 
 from diagnosis_engine.diagnosis_service import DiagnosisService
 from diagnosis_engine.models.context_diagnosis_classifier import ContextDiagnosisClassifier
@@ -25,9 +32,27 @@ from diagnosis_engine.models.no_context_diagnosis_classifier import NoContextDia
 patient_bp = Blueprint("patient", __name__, url_prefix="/patient")
 
 API_KEY = os.getenv("MISTRAL_API_KEY")
-UPLOAD_FOLDER = r"website/app/static/uploads"
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
 ALLOWED_EXTENSIONS = {"txt", "pdf", "docx", "png"}
 DIAGNOSIS_CSV_PATH = "data/raw/Doctor_Versus_Disease.csv"
+SPECIALIZATION_INDEX = SpecializationIndex(DIAGNOSIS_CSV_PATH)
+OCR_CACHE = ResultCache("data/cache/ocr", log_every=int(os.getenv("OCR_CACHE_LOG_EVERY", "100")))
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "4"))
+# extract all uploaded files of a submission in as few LLM requests as possible (opt-in: extraction
+# then waits for the OCR of every file)
+OCR_BATCH_EXTRACTION = os.getenv("OCR_BATCH_EXTRACTION", "0") == "1"
+# auto-crop stays off until scripts/check_preprocessing_quality.py has passed on real scans
+IMAGE_PREPROCESSOR = ImagePreprocessor(target_dpi=200, crop=os.getenv("OCR_IMAGE_CROP", "0") == "1")
+# shared per upstream: they hold the latency history used for hedging and the circuit breaker state
+OCR_CALLER = ResilientCaller("ocr", budget=float(os.getenv("OCR_BUDGET_SECONDS", "20")))
+EXTRACTION_CALLER = ResilientCaller("extraction", budget=float(os.getenv("EXTRACTION_BUDGET_SECONDS", "15")))
+# the symptom lexicon is shared; the LLM is skipped only for texts with enough
+# local symptom matches and nothing else to extract, and when it is unavailable the local result is used as is
+LLM_EXTRACTOR = MedicalInfoExtractor(API_KEY, cache=OCR_CACHE, caller=EXTRACTION_CALLER)
+EXTRACTOR = LocalMedicalInfoExtractor(fallback=LLM_EXTRACTOR)
+LLM_EXTRACTOR.fallback = EXTRACTOR.extract_local
+# build the lexicon from data/raw at startup rather than on the first upload
+EXTRACTOR.matcher()
 
 @patient_bp.route("/dashboard")
 def dashboard():
@@ -60,21 +85,14 @@ def video_call(appointment_id):
 
 
 # region AI_Diagnosis
-def get_suggested_doctors(diagnosis_result: str):
-    """Return a list of Doctor objects based on AI diagnosis using CSV mapping"""
-    if not diagnosis_result:
-        return []
+@patient_bp.errorhandler(413)
+def upload_too_large(error):
+    flash("The uploaded files are too large.", "danger")
+    return redirect(url_for("patient.ai_diagnosis"))
 
-    diagnosis_result_lower = diagnosis_result.lower()
-    matched_specializations = set()
-
-    with open(DIAGNOSIS_CSV_PATH, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            diag_name = row["diagnosis"].strip().lower()
-            spec_name = row["specialization"].strip()
-            if diag_name in diagnosis_result_lower:
-                matched_specializations.add(spec_name)
+def get_suggested_doctors(diagnosis_result: str):
+    """Return a list of Doctor objects based on AI diagnosis using the specialization index"""
+    matched_specializations = SPECIALIZATION_INDEX.specializations_for(diagnosis_result)
 
     if not matched_specializations:
         return []
@@ -133,21 +151,25 @@ def ai_diagnosis():
         cholesterol = request.form.get("cholesterol", "").strip()
 
         uploaded_files = request.files.getlist("files")
-        uploaded_file_paths = []
+        uploaded_documents = []
         invalid_files = []
+        oversized_files = []
 
         for file in uploaded_files:
             if file:
                 if allowed_file(file.filename):
-                    filename = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{file.filename}"
-                    filepath = os.path.join(UPLOAD_FOLDER, filename)
-                    file.save(filepath)
-                    uploaded_file_paths.append(filepath)
+                    try:
+                        uploaded_documents.append(checked_upload(file, MAX_UPLOAD_BYTES))
+                    except UploadTooLarge:
+                        oversized_files.append(file.filename)
                 else:
                     invalid_files.append(file.filename)
 
-        if invalid_files:
-            flash(f"The following files have invalid extensions: {', '.join(invalid_files)}. Allowed: txt, pdf, docx", "danger")
+        if invalid_files or oversized_files:
+            if invalid_files:
+                flash(f"The following files have invalid extensions: {', '.join(invalid_files)}. Allowed: txt, pdf, docx", "danger")
+            if oversized_files:
+                flash(f"The following files exceed {MAX_UPLOAD_BYTES // (1024 * 1024)} MB: {', '.join(oversized_files)}", "danger")
             return render_template(
                 "patient/ai_diagnosis.html",
                 user=user,
@@ -193,17 +215,14 @@ def ai_diagnosis():
                 patient_input += f"Reported symptoms: {symptoms_text}. "
 
         extracted_from_files = []
-        if model_type == "with_context" and uploaded_file_paths:
-            ocr = OCREngine(API_KEY)
-            extractor = MedicalInfoExtractor(API_KEY)
-            for filepath in uploaded_file_paths:
-                try:
-                    text = ocr.extract_text(filepath)
-                    info = extractor.extract(text)
-                    if "symptoms" in info and info["symptoms"]:
-                        extracted_from_files.extend(info["symptoms"])
-                except Exception as e:
-                    flash(f"Failed to process file {os.path.basename(filepath)}: {str(e)}", "danger")
+        if model_type == "with_context" and uploaded_documents:
+            ocr = OCREngine(API_KEY, cache=OCR_CACHE, preprocessor=IMAGE_PREPROCESSOR, caller=OCR_CALLER)
+            pipeline = DocumentPipeline(ocr, EXTRACTOR, max_concurrency=OCR_MAX_CONCURRENCY,
+                                        batch_extraction=OCR_BATCH_EXTRACTION)
+            results = pipeline.process(uploaded_documents)
+            extracted_from_files = pipeline.merged_symptoms(results)
+            for filename, error in pipeline.errors(results):
+                flash(f"Failed to process file {filename}: {error}", "danger")
 
             if extracted_from_files:
                 patient_input += f" Extracted symptoms from files: {', '.join(extracted_from_files)}. "
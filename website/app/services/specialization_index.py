@@ -0,0 +1,79 @@
+import csv
+import os
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from common.keyword_matcher import KeywordMatcher
+
+class SpecializationIndex:
+    """
+    In-memory disease -> specialization index built from Doctor_Versus_Disease.csv.
+    Diagnosis names are normalized (trimmed, lowercased, single spaces) and compiled into one
+    trie regex per specialization, results are memoized per diagnosis text (LRU, memo_size), and the CSV is
+    reloaded when its mtime changes. The mtime is checked at most once per check_interval.
+    """
+
+    def __init__(self, csv_path, check_interval=5.0, memo_size=4096):
+        self.csv_path = csv_path
+        self.check_interval = check_interval
+        self.memo_size = memo_size
+        self.lock = threading.Lock()
+        self.mtime = None
+        self.last_check = 0.0
+        self.matcher = None
+        self.lookup = None
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def load(self):
+        """Parses the CSV into {specialization: [normalized diagnosis names]}."""
+        diagnoses = {}
+        spellings = Counter()
+        with open(self.csv_path, newline="", encoding="utf-8") as csvfile:
+            for row in csv.DictReader(csvfile):
+                diag_name = self.normalize(row["diagnosis"] or "")
+                spec_name = (row["specialization"] or "").strip()
+                if not diag_name or not spec_name:
+                    continue
+                spellings[spec_name] += 1
+                diagnoses.setdefault(spec_name.lower(), []).append(diag_name)
+
+        # the CSV spells some specializations in several cases ("hepatologist"), keep the most common one
+        canonical = {}
+        for spec_name, _ in spellings.most_common():
+            canonical.setdefault(spec_name.lower(), spec_name)
+        return {canonical[key]: names for key, names in diagnoses.items()}
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.matcher is not None and now - self.last_check < self.check_interval:
+            return
+        with self.lock:
+            if self.matcher is not None and now - self.last_check < self.check_interval:
+                return
+            mtime = os.stat(self.csv_path).st_mtime_ns
+            if mtime != self.mtime:
+                self.matcher = KeywordMatcher(self.load())
+                self.lookup = self.build_lookup(self.matcher)
+                self.mtime = mtime
+            self.last_check = now
+
+    def build_lookup(self, matcher):
+        """Memoized matcher lookup; a new one is built on every reload, which drops the old entries."""
+        @lru_cache(maxsize=self.memo_size)
+        def lookup(key):
+            return frozenset(name for name, found in matcher.flags(key).items() if found)
+        return lookup
+
+    def specializations_for(self, diagnosis_result):
+        """Returns the set of specializations whose diagnosis names occur in the diagnosis text."""
+        if not diagnosis_result:
+            return set()
+        self.refresh()
+
+        return set(self.lookup(self.normalize(diagnosis_result)))
@@ -0,0 +1,24 @@
+import os
+
+class UploadTooLarge(ValueError):
+    pass
+
+def upload_size(file):
+    """Size of an uploaded FileStorage, measured by seeking its stream instead of reading it."""
+    stream = file.stream
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+def checked_upload(file, max_bytes):
+    """
+    Returns the upload itself, rewound, for OCREngine to read. Werkzeug has already parsed
+    the multipart body into file.stream (in memory when small, an anonymous temp file
+    otherwise) and closes it at the end of the request, so no further copy is made.
+    :raise UploadTooLarge: the file is larger than max_bytes (the whole body is capped by MAX_CONTENT_LENGTH)
+    """
+    if upload_size(file) > max_bytes:
+        raise UploadTooLarge(f"{file.filename} exceeds the {max_bytes} byte upload limit")
+    file.stream.seek(0)
+    return file